@@ -1,9 +1,12 @@
-import os
-from pathlib import Path
 import streamlit as st
 
-st.write("CWD:", os.getcwd())
-st.write("Exists my_app/assets:", (Path("assets").exists()))
-st.write("Exists ../assets:", (Path("..") / "assets").exists())
+from core.bootstrap import DEBUG, bootstrap, render_diagnostics
 
-st.switch_page("pages/0_Homepage.py")
\ No newline at end of file
+# Paths and assets are checked once per process, not per session
+bootstrap()
+
+if DEBUG:
+    render_diagnostics()
+    st.page_link("pages/0_Homepage.py", label="Continue to Homepage")
+else:
+    st.switch_page("pages/0_Homepage.py")
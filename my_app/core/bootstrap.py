@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import os
+from pathlib import Path
+
+import streamlit as st
+
+from core.data import CANDIDATES, GOLD_KEYS, find_dataset_file, validation_report
+
+# Process bootstrap
+#
+# Paths and assets are checked once per process instead of on every session.
+# Datasets are only located here: each page validates the current file version
+# of the tables it reads (see data.validation_report).
+# Diagnostics are only rendered with APP_DEBUG=1 (env, or a root level key in
+# Streamlit Secrets, which Streamlit exports to the environment).
+
+APP_DIR = Path(__file__).resolve().parents[1]  # .../my_app
+
+# Read by core.ui on every page, without running the startup checks
+STYLESHEET = APP_DIR / "assets" / "styles.css"
+
+DEBUG = os.getenv("APP_DEBUG", "").strip().lower() in ("1", "true", "yes")
+
+
+@dataclass(frozen=True)
+class AppPaths:
+    app_dir: Path
+    assets_dir: Path
+    club_logo_dir: Path
+    laliga_logo: Path
+    stylesheet: Path
+
+
+@dataclass(frozen=True)
+class Bootstrap:
+    paths: AppPaths
+    cwd: str
+    checks: dict[str, bool] = field(default_factory=dict)
+    datasets: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return all(self.checks.values())
+
+
+@st.cache_resource(show_spinner=False)
+def bootstrap() -> Bootstrap:
+    assets = APP_DIR / "assets"
+    paths = AppPaths(
+        app_dir=APP_DIR,
+        assets_dir=assets,
+        club_logo_dir=assets / "clubs",
+        laliga_logo=assets / "laliga" / "laliga_logo.png",
+        stylesheet=STYLESHEET,
+    )
+
+    checks = {
+        "assets": paths.assets_dir.is_dir(),
+        "club logos": paths.club_logo_dir.is_dir(),
+        "laliga logo": paths.laliga_logo.is_file(),
+        "stylesheet": paths.stylesheet.is_file(),
+    }
+
+    # Where each dataset resolves to, gold tables are required
+    datasets = {}
+    for key in CANDIDATES:
+        try:
+            datasets[key] = str(find_dataset_file(key))
+        except FileNotFoundError:
+            datasets[key] = ""
+        if key in GOLD_KEYS:
+            checks[key] = bool(datasets[key])
+
+    return Bootstrap(paths=paths, cwd=os.getcwd(), checks=checks, datasets=datasets)
+
+
+def render_diagnostics() -> None:
+    # Imported here, only debug runs need them
+    from core.data import data_cache_stats
+    from core.state import session_memory_report
+
+    boot = bootstrap()
+    st.subheader("Diagnostics")
+    st.write("CWD:", boot.cwd)
+    st.write("App dir:", str(boot.paths.app_dir))
+    st.write("Checks:", boot.checks)
+    st.write("Datasets:", boot.datasets)
+    for key in GOLD_KEYS:
+        if boot.datasets.get(key):
+            report = validation_report(key)
+            st.write(f"Validation {key}:", {"errors": report.errors, "warnings": report.warnings})
+    st.write("Data cache:", data_cache_stats())
+    st.write("Session memory:", session_memory_report())
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+import sys
+import threading
+import time
+from typing import Callable, Hashable
+
+import pandas as pd
+
+# Cache policy shared by the dataset caches
+#
+# Entries are kept in LRU order together with their estimated memory footprint
+# (DataFrame.memory_usage(deep=True) for frames). The cache holds a global byte
+# budget, optional TTLs per group (usually the dataset key) and a bounded log
+# of every eviction with its reason.
+
+
+def estimate_bytes(value) -> int:
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_bytes(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_bytes(k) + estimate_bytes(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+
+@dataclass
+class CacheEntry:
+    value: object
+    nbytes: int
+    group: str
+    expires_at: float | None
+
+
+class BoundedCache:
+    def __init__(
+        self,
+        byte_budget: int,
+        ttls: dict[str, float] | None = None,
+        default_ttl: float | None = None,
+        log_size: int = 500,
+    ):
+        self.byte_budget = byte_budget
+        self.ttls = dict(ttls or {})
+        self.default_ttl = default_ttl
+        self._entries: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._load_locks: dict[Hashable, threading.Lock] = {}
+        self._log: deque[dict] = deque(maxlen=log_size)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # Internal helpers, call with self._lock held
+    def _evict(self, key: Hashable, reason: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.nbytes
+        self.evictions += 1
+        self._log.append(
+            {"time": time.time(), "key": key, "group": entry.group, "bytes": entry.nbytes, "reason": reason}
+        )
+
+    def _enforce_budget(self) -> None:
+        # Least recently used first, the newest entry is always kept
+        while self._bytes > self.byte_budget and len(self._entries) > 1:
+            self._evict(next(iter(self._entries)), "budget")
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if entry.expires_at is not None and entry.expires_at <= time.monotonic():
+                self._evict(key, "ttl")
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def put(self, key: Hashable, value, group: str = "", replace_group: bool = False, nbytes: int | None = None) -> None:
+        size = estimate_bytes(value) if nbytes is None else nbytes
+        ttl = self.ttls.get(group, self.default_ttl)
+        with self._lock:
+            if key in self._entries:
+                self._evict(key, "replaced")
+            # A new version of a dataset makes the older versions unreachable
+            if replace_group:
+                for old in [k for k, e in self._entries.items() if e.group == group]:
+                    self._evict(old, "stale")
+            self._entries[key] = CacheEntry(
+                value=value,
+                nbytes=size,
+                group=group,
+                expires_at=None if ttl is None else time.monotonic() + ttl,
+            )
+            self._bytes += size
+            self._enforce_budget()
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], object], group: str = "", replace_group: bool = False):
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+
+        # One loader per key, concurrent callers wait for the first one
+        with self._lock:
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+        try:
+            with load_lock:
+                with self._lock:
+                    entry = self._entries.get(key)
+                    if entry is not None and (entry.expires_at is None or entry.expires_at > time.monotonic()):
+                        return entry.value
+                value = loader()
+                self.put(key, value, group=group, replace_group=replace_group)
+        finally:
+            # Also when the loader raised, the next caller retries with a fresh lock
+            with self._lock:
+                self._load_locks.pop(key, None)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._entries):
+                self._evict(key, "cleared")
+
+    def eviction_log(self) -> list[dict]:
+        with self._lock:
+            return list(self._log)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "byte_budget": self.byte_budget,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import json
 import os
+import time
 import pandas as pd
 import streamlit as st
 
+from core.cache import BoundedCache
+from core.validation import ValidationReport, key_columns, validate
+
 # Dataset filenames you accept for each key
 CANDIDATES = {
     "matchday_overview_gold": ["matchday_overview_gold.parquet", "matchday_overview_gold.csv"],
@@ -12,6 +18,40 @@ CANDIDATES = {
     "clubs_silver": ["clubs_silver.parquet", "clubs_silver.csv"],
 }
 
+# Global memory budget for loaded datasets, all keys and file versions together
+DATA_CACHE_BYTES = int(os.getenv("DATA_CACHE_BYTES", str(512 * 1024 * 1024)))
+
+# Seconds a loaded dataset stays cached before it is read again
+DATASET_TTLS = {
+    "matchday_overview_gold": 6 * 3600,
+    "club_match_kpis_gold": 6 * 3600,
+    "clubs_silver": 24 * 3600,
+    "clubs_dim": 24 * 3600,
+    "clubs_lookup": 24 * 3600,
+}
+
+# Seconds the club name and logo lookups reuse their source file versions
+CLUB_SOURCES_CHECK_SECONDS = 1.0
+
+# Seconds a failed dataset search is remembered before the folders are searched again
+MISSING_RECHECK_SECONDS = int(os.getenv("MISSING_RECHECK_SECONDS", "60"))
+
+# Gold tables keep integer club IDs only, names come from the club dimension
+GOLD_KEYS = ("matchday_overview_gold", "club_match_kpis_gold")
+
+# (id column, free-text name column) pairs found in the gold tables
+CLUB_COLUMNS = [
+    ("home_club_id", "home_club_name"),
+    ("away_club_id", "away_club_name"),
+    ("club_id", "club_name"),
+]
+
+# Integer key columns of the gold tables, stored as float in some exports (e.g. a
+# csv with a blank cell), read as nullable integers
+ID_COLUMNS = ["match_id", "matchday"]
+
+CLUB_LOGO_DIR = Path(__file__).resolve().parents[1] / "assets" / "clubs"
+
 def _repo_root() -> Path:
     # data.py is in: <repo>/my_app/core/data.py
     # parents[0] = core, parents[1] = my_app, parents[2] = repo
@@ -35,16 +75,32 @@ def _data_dirs() -> list[Path]:
         root / "my_app" / "data",
     ]
 
-def _find_dataset_file(dataset_key: str) -> Path:
+# Resolved dataset paths, searched once per process while the file stays in place
+_RESOLVED: dict[str, Path] = {}
+
+# Failed searches (optional datasets such as clubs_silver): key -> (time, message)
+_MISSING: dict[str, tuple[float, str]] = {}
+
+def find_dataset_file(dataset_key: str) -> Path:
     if dataset_key not in CANDIDATES:
         raise KeyError(f"Unknown dataset key: {dataset_key}. Known: {list(CANDIDATES)}")
 
+    known = _RESOLVED.get(dataset_key)
+    if known is not None and known.exists():
+        return known
+
+    missing = _MISSING.get(dataset_key)
+    if missing is not None and time.monotonic() - missing[0] < MISSING_RECHECK_SECONDS:
+        raise FileNotFoundError(missing[1])
+
     searched: list[str] = []
     for d in _data_dirs():
         for fname in CANDIDATES[dataset_key]:
             p = d / fname
             searched.append(str(p))
             if p.exists():
+                _RESOLVED[dataset_key] = p
+                _MISSING.pop(dataset_key, None)
                 return p
 
     # Helpful debug: show what actually exists near the searched dirs
@@ -53,24 +109,383 @@ def _find_dataset_file(dataset_key: str) -> Path:
         if d.exists():
             nearby += [str(x) for x in d.glob("*")][:30]
 
-    raise FileNotFoundError(
+    message = (
         f"Could not find {dataset_key}. Searched: {searched}. "
         f"Existing files in those dirs (sample): {nearby}"
     )
+    _MISSING[dataset_key] = (time.monotonic(), message)
+    raise FileNotFoundError(message)
 
-@st.cache_data(show_spinner=False)
-def load_df(dataset_key: str) -> pd.DataFrame:
-    path = _find_dataset_file(dataset_key)
+def file_version(path: Path) -> tuple[str, int, int]:
+    # A changed mtime or size means a new file version, cached under a new key
+    stat = path.stat()
+    return str(path), stat.st_mtime_ns, stat.st_size
 
+# One bounded cache per process for datasets and everything derived from them
+# (validation reports, club dimension, query results, form index)
+@st.cache_resource(show_spinner=False)
+def dataset_cache() -> BoundedCache:
+    return BoundedCache(DATA_CACHE_BYTES, ttls=DATASET_TTLS)
+
+def _read_file(path: Path, columns: list[str] | None = None) -> pd.DataFrame:
     if path.suffix.lower() == ".parquet":
-        df = pd.read_parquet(path)
+        if columns is not None:
+            import pyarrow.parquet as pq
+
+            names = set(pq.read_schema(path).names)
+            columns = [c for c in columns if c in names]
+        return pd.read_parquet(path, columns=columns)
     elif path.suffix.lower() == ".csv":
-        df = pd.read_csv(path)
+        if columns is not None:
+            wanted = set(columns)
+            return pd.read_csv(path, usecols=lambda c: c in wanted)
+        return pd.read_csv(path)
     else:
         raise ValueError(f"Unsupported file type: {path.suffix}")
 
-    # Basic cleanup for stable UI behavior
+def _to_int_id(s: pd.Series) -> pd.Series:
+    # Float-like or text ids such as 123.0 or "123" from parquet/csv become nullable integers
+    return pd.to_numeric(s, errors="coerce").round().astype("Int64")
+
+def parse_id(value) -> int | None:
+    # One id from a query param, session value, widget key or table cell, with the
+    # same rules as _to_int_id: "123", 123.0 and "123.0" are ids, "123.5", "inf",
+    # "abc", NaN and pd.NA are not. A one item list (query params) is unwrapped.
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if value is None:
+        return None
+    s = str(value).strip()
+    try:
+        return int(s)
+    except ValueError:
+        pass
+    try:
+        f = float(s)
+        return int(f) if f.is_integer() else None
+    except (ValueError, OverflowError):
+        return None
+
+def _read_dataset(path: Path, dataset_key: str) -> pd.DataFrame:
+    return prepare_dataset(_read_file(path), dataset_key)
+
+def prepare_dataset(df: pd.DataFrame, dataset_key: str) -> pd.DataFrame:
+    # Basic cleanup for stable UI behavior, applied to every frame read from a dataset
     if "match_date" in df.columns:
         df["match_date"] = pd.to_datetime(df["match_date"], errors="coerce")
 
+    if dataset_key in GOLD_KEYS:
+        for col in ID_COLUMNS:
+            if col in df.columns:
+                df[col] = _to_int_id(df[col])
+
+        for id_col, name_col in CLUB_COLUMNS:
+            if id_col in df.columns:
+                df[id_col] = _to_int_id(df[id_col])
+                # Names are joined from the club dimension when needed
+                if name_col in df.columns:
+                    df = df.drop(columns=name_col)
+
+    return df
+
+def dataset_version(dataset_key: str) -> tuple[str, int, int]:
+    return file_version(find_dataset_file(dataset_key))
+
+def _read_and_validate(cache: BoundedCache, path: Path, dataset_key: str) -> pd.DataFrame:
+    df = _read_dataset(path, dataset_key)
+
+    # Validated once per file version, while the frame is at hand
+    cache.put(
+        ("validation", dataset_key, *file_version(path)),
+        validate(dataset_key, df.iloc[0:0], df),
+        group=f"validation:{dataset_key}",
+        replace_group=True,
+    )
     return df
+
+def _load_cached(cache: BoundedCache, dataset_key: str) -> pd.DataFrame:
+    path = find_dataset_file(dataset_key)
+    return cache.get_or_load(
+        (dataset_key, *file_version(path)),
+        lambda: _read_and_validate(cache, path, dataset_key),
+        group=dataset_key,
+        replace_group=True,
+    )
+
+def load_df(dataset_key: str) -> pd.DataFrame:
+    # The returned frame is shared by all sessions, copy it before mutating
+    return _load_cached(dataset_cache(), dataset_key)
+
+def load_many(dataset_keys: list[str], max_workers: int | None = None) -> dict[str, pd.DataFrame]:
+    # Read several datasets at the same time, parquet/csv decoding releases the GIL,
+    # so a cold load takes as long as the slowest file instead of the sum
+    keys = list(dict.fromkeys(dataset_keys))
+    for key in keys:
+        if key not in CANDIDATES:
+            raise KeyError(f"Unknown dataset key: {key}. Known: {list(CANDIDATES)}")
+
+    # Resolve the cache on the calling thread, workers have no script run context
+    cache = dataset_cache()
+    if len(keys) <= 1:
+        return {key: _load_cached(cache, key) for key in keys}
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(keys), thread_name_prefix="load_many") as pool:
+        futures = {key: pool.submit(_load_cached, cache, key) for key in keys}
+        return {key: fut.result() for key, fut in futures.items()}
+
+def prefetch(dataset_keys: list[str]) -> None:
+    # validation_report and load_match_rows read a csv or single row group parquet
+    # whole: a cold page loads those files together instead of one after the other
+    cache = dataset_cache()
+    whole = []
+    for key in dataset_keys:
+        path = find_dataset_file(key)
+        if cache.get((key, *file_version(path))) is None and not _reads_by_row_group(path):
+            whole.append(key)
+    if whole:
+        load_many(whole)
+
+def _validate_file(cache: BoundedCache, path: Path, dataset_key: str) -> ValidationReport:
+    # A csv or single row group parquet is read whole anyway (see load_match_rows)
+    full = cache.get((dataset_key, *file_version(path)))
+    if full is None and not _reads_by_row_group(path):
+        full = _load_cached(cache, dataset_key)
+        # Validated by _read_and_validate while the file was read
+        stored = cache.get(("validation", dataset_key, *file_version(path)))
+        if stored is not None:
+            return stored
+    if full is not None:
+        return validate(dataset_key, full.iloc[0:0], full)
+
+    # Parquet without the table in memory: schema from the footer, rows from the key columns only
+    import pyarrow.parquet as pq
+
+    schema = prepare_dataset(pq.read_schema(path).empty_table().to_pandas(), dataset_key)
+    rows = prepare_dataset(_read_file(path, columns=key_columns(dataset_key)), dataset_key)
+    return validate(dataset_key, schema, rows)
+
+def validation_report(dataset_key: str) -> ValidationReport:
+    # Cached per file version, page reruns only read the stored report
+    path = find_dataset_file(dataset_key)
+    cache = dataset_cache()
+    return cache.get_or_load(
+        ("validation", dataset_key, *file_version(path)),
+        lambda: _validate_file(cache, path, dataset_key),
+        group=f"validation:{dataset_key}",
+        replace_group=True,
+    )
+
+def data_cache_stats() -> dict:
+    return dataset_cache().stats()
+
+def data_cache_eviction_log() -> list[dict]:
+    return dataset_cache().eviction_log()
+
+# Club dimension
+def _club_sources() -> list[tuple[str, Path]]:
+    sources = []
+    for key in ("clubs_silver", *GOLD_KEYS):
+        try:
+            sources.append((key, find_dataset_file(key)))
+        except FileNotFoundError:
+            continue
+    return sources
+
+def _build_club_dim(sources: list[tuple[str, Path]]) -> pd.DataFrame:
+    frames = []
+    for key, path in sources:
+        if key == "clubs_silver":
+            raw = _read_file(path)
+            name_col = "club_name" if "club_name" in raw.columns else "name"
+            if "club_id" in raw.columns and name_col in raw.columns:
+                frames.append(raw[["club_id", name_col]].set_axis(["club_id", "club_name"], axis=1))
+            continue
+
+        # Fallback and gap filler: names still carried by the gold files
+        raw = _read_file(path, columns=[c for pair in CLUB_COLUMNS for c in pair])
+        for id_col, name_col in CLUB_COLUMNS:
+            if id_col in raw.columns and name_col in raw.columns:
+                frames.append(raw[[id_col, name_col]].set_axis(["club_id", "club_name"], axis=1))
+
+    if not frames:
+        dim = pd.DataFrame({"club_id": pd.Series(dtype="int64"), "club_name": pd.Series(dtype="string")})
+    else:
+        dim = pd.concat(frames, ignore_index=True)
+
+    # First source wins, so clubs_silver names take precedence over gold names
+    dim["club_id"] = _to_int_id(dim["club_id"])
+    dim["club_name"] = dim["club_name"].astype("string").str.strip()
+    dim = dim.dropna(subset=["club_id", "club_name"])
+    dim = dim.drop_duplicates("club_id", keep="first")
+    dim["club_id"] = dim["club_id"].astype("int64")
+    dim = dim.set_index("club_id").sort_index()
+
+    # Logo paths resolved once, render paths only do dictionary lookups
+    logos = {int(p.stem): str(p) for p in CLUB_LOGO_DIR.glob("*.png") if p.stem.isdigit()}
+    dim["logo_path"] = pd.Series(dim.index.map(logos.get), index=dim.index, dtype="object")
+    return dim
+
+def load_clubs() -> pd.DataFrame:
+    # Indexed by integer club_id, columns: club_name, logo_path (None without logo)
+    sources = _club_sources()
+    return dataset_cache().get_or_load(
+        ("clubs_dim", *(file_version(path) for _, path in sources)),
+        lambda: _build_club_dim(sources),
+        group="clubs_dim",
+        replace_group=True,
+    )
+
+def join_clubs(df: pd.DataFrame) -> pd.DataFrame:
+    # Adds home_club_name / away_club_name / club_name next to their id columns.
+    # Mapped through a plain dict: the lazily built hash engine of a shared pandas
+    # Index is not safe to initialize from concurrent sessions.
+    names = _club_lookup()["names"]
+    out = df.copy()
+    for id_col, name_col in CLUB_COLUMNS:
+        if id_col in out.columns:
+            out[name_col] = out[id_col].map(names).astype("string")
+    return out
+
+# (checked at, cache key) of the club sources, shared by all sessions
+_CLUB_KEY: tuple[float, tuple] | None = None
+
+def _club_lookup_key() -> tuple:
+    # Source files and versions are checked at most once per CLUB_SOURCES_CHECK_SECONDS,
+    # so a page rendering many club logos does not stat the data files for each one
+    global _CLUB_KEY
+    known = _CLUB_KEY
+    if known is not None and time.monotonic() - known[0] < CLUB_SOURCES_CHECK_SECONDS:
+        return known[1]
+    key = ("clubs_lookup", *(file_version(path) for _, path in _club_sources()))
+    _CLUB_KEY = (time.monotonic(), key)
+    return key
+
+def _club_lookup() -> dict[str, dict[int, str]]:
+    # Plain dicts built once per dimension version, for per-card lookups in render paths
+    def build() -> dict[str, dict[int, str]]:
+        dim = load_clubs()
+        return {
+            "names": {int(i): str(n) for i, n in dim["club_name"].items() if pd.notna(n)},
+            "logos": {int(i): p for i, p in dim["logo_path"].items() if isinstance(p, str)},
+        }
+
+    return dataset_cache().get_or_load(
+        _club_lookup_key(),
+        build,
+        group="clubs_lookup",
+        replace_group=True,
+    )
+
+def club_name(club_id, default: str = "") -> str:
+    cid = parse_id(club_id)
+    if cid is None:
+        return default
+    return _club_lookup()["names"].get(cid, default)
+
+def club_logo_path(club_id) -> str | None:
+    cid = parse_id(club_id)
+    if cid is None:
+        return None
+    return _club_lookup()["logos"].get(cid)
+
+# By-ID access for deep links
+#
+# A sidecar file next to each parquet gold table maps match_id to its row group
+# and row offsets, so a single match is read without loading the whole table.
+# This only pays off when the file has several row groups: write the gold files
+# with a bounded row group size (e.g. df.to_parquet(path, row_group_size=MATCH_ROW_GROUP_ROWS)).
+# A file in one row group is loaded once with load_df and every link slices it.
+
+MATCH_ROW_GROUP_ROWS = 2_000
+
+MATCH_INDEX_SUFFIX = ".match_index.json"
+
+def _match_index_path(path: Path) -> Path:
+    return path.with_name(path.name + MATCH_INDEX_SUFFIX)
+
+def _build_match_index(path: Path) -> dict[str, dict[int, list[int]]]:
+    import pyarrow.parquet as pq
+
+    index: dict[str, dict[int, list[int]]] = {}
+    pf = pq.ParquetFile(path)
+    for rg in range(pf.num_row_groups):
+        ids = _to_int_id(pf.read_row_group(rg, columns=["match_id"]).column(0).to_pandas())
+        for mid, offsets in pd.Series(range(len(ids))).groupby(ids.to_numpy(), dropna=True).groups.items():
+            index.setdefault(str(int(mid)), {})[rg] = [int(o) for o in offsets]
+    return index
+
+def _load_match_index(path: Path) -> dict[str, dict[int, list[int]]]:
+    _, mtime_ns, size = file_version(path)
+    sidecar = _match_index_path(path)
+
+    try:
+        payload = json.loads(sidecar.read_text(encoding="utf-8"))
+        if payload.get("mtime_ns") == mtime_ns and payload.get("size") == size:
+            return {mid: {int(rg): offs for rg, offs in groups.items()} for mid, groups in payload["matches"].items()}
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+
+    index = _build_match_index(path)
+    try:
+        sidecar.write_text(
+            json.dumps({"file": path.name, "mtime_ns": mtime_ns, "size": size, "matches": index}),
+            encoding="utf-8",
+        )
+    except OSError:
+        # Read-only data folder (e.g. on Cloud), keep the index in memory only
+        pass
+    return index
+
+def _read_match_rows(path: Path, dataset_key: str, match_id: int) -> pd.DataFrame:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    index = dataset_cache().get_or_load(
+        ("match_index", dataset_key, *file_version(path)),
+        lambda: _load_match_index(path),
+        group=f"match_index:{dataset_key}",
+        replace_group=True,
+    )
+    groups = index.get(str(match_id), {})
+
+    pf = pq.ParquetFile(path)
+    if not groups:
+        return prepare_dataset(pf.schema_arrow.empty_table().to_pandas(), dataset_key)
+
+    # Only the row groups holding this match are decoded
+    tables = [pf.read_row_group(rg).take(pa.array(offsets)) for rg, offsets in sorted(groups.items())]
+    return prepare_dataset(pa.concat_tables(tables).to_pandas(), dataset_key)
+
+def _reads_by_row_group(path: Path) -> bool:
+    if path.suffix.lower() != ".parquet":
+        return False
+    import pyarrow.parquet as pq
+
+    return pq.ParquetFile(path).metadata.num_row_groups > 1
+
+def load_match_rows(dataset_key: str, match_id: int | None) -> pd.DataFrame:
+    # Rows of one match only, the returned frame is shared, copy it before mutating
+    path = find_dataset_file(dataset_key)
+    version = file_version(path)
+    cache = dataset_cache()
+
+    # Full table already in memory (warm server), a csv, or a parquet file in a
+    # single row group: one cached full read serves every match
+    full = cache.get((dataset_key, *version))
+    if full is None and not _reads_by_row_group(path):
+        full = load_df(dataset_key)
+    if full is not None:
+        if match_id is None:
+            return full.iloc[0:0]
+        return full[pd.to_numeric(full["match_id"], errors="coerce") == match_id]
+
+    if match_id is None:
+        return _read_match_rows(path, dataset_key, -1)
+
+    # A new file version replaces the cached rows of the same match
+    return cache.get_or_load(
+        ("match_rows", dataset_key, match_id, *version),
+        lambda: _read_match_rows(path, dataset_key, match_id),
+        group=f"match_rows:{dataset_key}:{match_id}",
+        replace_group=True,
+    )
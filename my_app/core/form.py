@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from core.data import dataset_cache, dataset_version, load_df
+
+# Club form timeline
+#
+# club_match_kpis_gold, with match dates from matchday_overview_gold, is sorted
+# once per file version by club and match date, together with cumulative sums
+# of the form metrics. The previous N matches of a club before a fixture are
+# then one contiguous slice of that frame, and their averages two lookups in
+# the cumulative sums, with no groupby per request. Fixtures without a match
+# date are left out of the index.
+
+FORM_METRICS = ["usage_rate", "pct_deployed", "weighted_market_value_used"]
+
+
+class FormIndex(NamedTuple):
+    frame: pd.DataFrame  # sorted by club_id, match_date, match_id
+    positions: dict  # (match_id, club_id) -> row position in frame
+    block_start: np.ndarray  # first row of the club's block, for every row
+    sums: np.ndarray  # cumulative metric sums, one leading zero row
+    counts: np.ndarray  # cumulative non-missing counts, one leading zero row
+
+
+def build_form_index(kpis: pd.DataFrame, matches: pd.DataFrame) -> FormIndex:
+    cols = ["match_id", "club_id", "matchday"] + FORM_METRICS
+    frame = kpis[[c for c in cols if c in kpis.columns]].dropna(subset=["match_id", "club_id"])
+
+    # Match dates live in matchday_overview_gold
+    if "match_date" in matches.columns:
+        dates = matches[["match_id", "match_date"]].dropna(subset=["match_id"]).drop_duplicates("match_id")
+        frame = frame.merge(dates, on="match_id", how="left")
+    else:
+        frame = frame.assign(match_date=pd.NaT)
+
+    # An undated fixture has no place on the timeline: it neither has a form
+    # window nor counts in the window of a later match
+    frame = frame.dropna(subset=["match_date"])
+    frame = frame.sort_values(["club_id", "match_date", "match_id"], kind="mergesort").reset_index(drop=True)
+    for m in FORM_METRICS:
+        if m not in frame.columns:
+            frame[m] = np.nan
+
+    n = len(frame)
+    club = frame["club_id"].to_numpy(dtype="int64")
+    new_block = np.ones(n, dtype=bool)
+    new_block[1:] = club[1:] != club[:-1]
+    block_start = np.maximum.accumulate(np.where(new_block, np.arange(n), 0)) if n else np.zeros(0, dtype="int64")
+
+    values = frame[FORM_METRICS].to_numpy(dtype="float64", na_value=np.nan)
+    present = ~np.isnan(values)
+    sums = np.vstack([np.zeros((1, len(FORM_METRICS))), np.cumsum(np.where(present, values, 0.0), axis=0)])
+    counts = np.vstack([np.zeros((1, len(FORM_METRICS))), np.cumsum(present, axis=0)])
+
+    positions = dict(zip(zip(frame["match_id"].astype("int64"), club), range(n)))
+    return FormIndex(frame, positions, block_start, sums, counts)
+
+
+def load_form_index() -> FormIndex:
+    # Built once per version of the two gold tables
+    return dataset_cache().get_or_load(
+        ("form_index", dataset_version("club_match_kpis_gold"), dataset_version("matchday_overview_gold")),
+        lambda: build_form_index(load_df("club_match_kpis_gold"), load_df("matchday_overview_gold")),
+        group="form_index",
+        replace_group=True,
+    )
+
+
+def _window(index: FormIndex, match_id, club_id, n: int) -> tuple[int, int] | None:
+    try:
+        pos = index.positions.get((int(match_id), int(club_id)))
+    except (TypeError, ValueError):
+        return None
+    if pos is None:
+        return None
+    return max(int(index.block_start[pos]), pos - int(n)), pos
+
+
+def club_form(match_id, club_id, n: int = 5) -> pd.DataFrame:
+    # The club's previous n matches before this fixture, oldest first
+    index = load_form_index()
+    bounds = _window(index, match_id, club_id, n)
+    if bounds is None:
+        return index.frame.iloc[0:0]
+    start, stop = bounds
+    return index.frame.iloc[start:stop]
+
+
+def club_form_averages(match_id, club_id, n: int = 5) -> dict[str, float]:
+    # Mean of each form metric over the previous n matches (NaN without data)
+    index = load_form_index()
+    bounds = _window(index, match_id, club_id, n)
+    if bounds is None:
+        return {m: np.nan for m in FORM_METRICS}
+    start, stop = bounds
+    total = index.sums[stop] - index.sums[start]
+    count = index.counts[stop] - index.counts[start]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.where(count > 0, total / np.maximum(count, 1), np.nan)
+    return dict(zip(FORM_METRICS, means.tolist()))
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import re
+import threading
+
+import duckdb
+import pandas as pd
+import streamlit as st
+
+from core.data import GOLD_KEYS, dataset_cache, file_version, find_dataset_file, prepare_dataset
+
+# Query layer over the gold files
+#
+# The gold parquet/csv files are registered as views in an in-process DuckDB
+# database, so named queries run directly on the files instead of on frames
+# held in memory. Results are cached by query name, parameters and the file
+# versions they read, in the same bounded cache as load_df. A new file version
+# replaces the cached result of the same query and parameters.
+#
+# Columns that validation.SCHEMAS treats as optional (season, competition,
+# kickoff_time, match_date, the KPI metrics) may be missing from a file. Each
+# query is built from the columns its view actually has: a filter on a missing
+# column is dropped, as the pages do when the column is absent.
+
+
+def _optional_filter(columns: set[str], column: str) -> str:
+    # A NULL parameter means "all"
+    return f" AND (${column} IS NULL OR {column} = ${column})" if column in columns else ""
+
+
+def _order_by(columns: set[str], wanted: list[str]) -> str:
+    present = [c for c in wanted if c in columns]
+    return " ORDER BY " + ", ".join(present) if present else ""
+
+
+def _matchdays_sql(columns: set[str]) -> str:
+    # Distinct filter values for the overview sidebar
+    keys = [c for c in ("season", "competition") if c in columns] + ["matchday"]
+    return (
+        f"SELECT DISTINCT {', '.join(keys)} FROM matchday_overview_gold"
+        " WHERE matchday IS NOT NULL" + _order_by(columns, keys)
+    )
+
+
+def _matchday_slice_sql(columns: set[str]) -> str:
+    return (
+        "SELECT * FROM matchday_overview_gold WHERE matchday = $matchday"
+        + _optional_filter(columns, "season")
+        + _optional_filter(columns, "competition")
+        + _order_by(columns, ["match_date", "kickoff_time", "match_id"])
+    )
+
+
+def _match_sheet_sql(columns: set[str]) -> str:
+    order = " ORDER BY CASE club_side WHEN 'home' THEN 0 WHEN 'away' THEN 1 ELSE 2 END" if "club_side" in columns else ""
+    return "SELECT * FROM club_match_kpis_gold WHERE match_id = $match_id" + order
+
+
+# Averaged per club and season, output name -> source column
+AGGREGATE_METRICS = {
+    "avg_players_used": "players_used",
+    "avg_usage_rate": "usage_rate",
+    "avg_pct_deployed": "pct_deployed",
+    "avg_age_used": "avg_age_used",
+    "avg_weighted_age_used": "weighted_age_used",
+    "avg_weighted_market_value_used": "weighted_market_value_used",
+    "avg_deployed_squad_market_value": "deployed_squad_market_value",
+}
+
+
+def _club_season_aggregates_sql(columns: set[str]) -> str:
+    keys = (["season"] if "season" in columns else []) + ["club_id"]
+    metrics = [f"AVG({col}) AS {name}" for name, col in AGGREGATE_METRICS.items() if col in columns]
+    select = ", ".join(keys + ["COUNT(*) AS matches"] + metrics)
+    where = " WHERE TRUE" + _optional_filter(columns, "season")
+    group = ", ".join(keys)
+    return f"SELECT {select} FROM club_match_kpis_gold{where} GROUP BY {group} ORDER BY {group}"
+
+
+# Named queries: SQL builder from the view's columns, parameters use DuckDB's $name syntax
+QUERIES = {
+    "matchdays": _matchdays_sql,
+    "matchday_slice": _matchday_slice_sql,
+    "match_sheet": _match_sheet_sql,
+    "club_season_aggregates": _club_season_aggregates_sql,
+}
+
+# Gold dataset each query reads, its result gets the same cleanup as load_df
+QUERY_SOURCES = {
+    "matchdays": "matchday_overview_gold",
+    "matchday_slice": "matchday_overview_gold",
+    "match_sheet": "club_match_kpis_gold",
+    "club_season_aggregates": "club_match_kpis_gold",
+}
+
+QUERY_PARAMS = {
+    "matchdays": (),
+    "matchday_slice": ("matchday", "season", "competition"),
+    "match_sheet": ("match_id",),
+    "club_season_aggregates": ("season",),
+}
+
+
+class _Engine:
+    # One DuckDB database per process, views are refreshed when a file changes
+
+    def __init__(self):
+        self._con = duckdb.connect(database=":memory:")
+        self._versions: dict[str, tuple] = {}
+        self._columns: dict[str, frozenset[str]] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, dataset_key: str) -> tuple:
+        path = find_dataset_file(dataset_key)
+        version = file_version(path)
+        if self._versions.get(dataset_key) != version:
+            reader = "read_parquet" if path.suffix.lower() == ".parquet" else "read_csv_auto"
+            location = str(path).replace("'", "''")
+            self._con.execute(f"CREATE OR REPLACE VIEW {dataset_key} AS SELECT * FROM {reader}('{location}')")
+            self._columns[dataset_key] = frozenset(r[0] for r in self._con.execute(f"DESCRIBE {dataset_key}").fetchall())
+            self._versions[dataset_key] = version
+        return version
+
+    def versions(self, dataset_keys: tuple[str, ...]) -> tuple:
+        with self._lock:
+            return tuple(self._register(key) for key in dataset_keys)
+
+    def columns(self, dataset_key: str) -> frozenset[str]:
+        with self._lock:
+            self._register(dataset_key)
+            return self._columns[dataset_key]
+
+    def execute(self, sql: str, params: dict) -> pd.DataFrame:
+        # A cursor is a separate connection to the same database, safe per thread
+        with self._lock:
+            cursor = self._con.cursor()
+        try:
+            return cursor.execute(sql, params).df()
+        finally:
+            cursor.close()
+
+
+@st.cache_resource(show_spinner=False)
+def _engine() -> _Engine:
+    return _Engine()
+
+
+def run_query(name: str, **params) -> pd.DataFrame:
+    # The returned frame is shared by all sessions, copy it before mutating
+    if name not in QUERIES:
+        raise KeyError(f"Unknown query: {name}. Known: {list(QUERIES)}")
+
+    unknown = set(params) - set(QUERY_PARAMS[name])
+    if unknown:
+        raise TypeError(f"Unknown parameters for {name}: {sorted(unknown)}")
+    bound = {p: params.get(p) for p in QUERY_PARAMS[name]}
+
+    engine = _engine()
+    source = QUERY_SOURCES[name]
+    versions = engine.versions(GOLD_KEYS)
+
+    def run() -> pd.DataFrame:
+        sql = QUERIES[name](set(engine.columns(source)))
+        # Only parameters the built query uses, a dropped filter drops its parameter
+        used = set(re.findall(r"\$(\w+)", sql))
+        return prepare_dataset(engine.execute(sql, {p: v for p, v in bound.items() if p in used}), source)
+
+    # One group per (name, parameters): a new file version replaces the older result
+    key = tuple(sorted(bound.items()))
+    return dataset_cache().get_or_load(
+        ("query", name, key, versions),
+        run,
+        group=f"query:{name}:{key}",
+        replace_group=True,
+    )
+
+
+def matchdays() -> pd.DataFrame:
+    return run_query("matchdays")
+
+
+def matchday_slice(matchday: int, season: str | None = None, competition: str | None = None) -> pd.DataFrame:
+    return run_query("matchday_slice", matchday=int(matchday), season=season, competition=competition)
+
+
+def match_sheet(match_id) -> pd.DataFrame:
+    return run_query("match_sheet", match_id=int(match_id))
+
+
+def club_season_aggregates(season: str | None = None) -> pd.DataFrame:
+    return run_query("club_season_aggregates", season=season)
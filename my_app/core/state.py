@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from core.cache import BoundedCache, estimate_bytes
+
+# Managed session state
+#
+# Only small values (IDs, flags, short strings) live in st.session_state.
+# Heavy objects such as sliced frames go to one process wide store shared by
+# all sessions, and the session only keeps the key pointing to them.
+
+# Byte budget for everything one session keeps in st.session_state
+SESSION_BYTE_BUDGET = int(os.getenv("SESSION_BYTE_BUDGET", str(64 * 1024)))
+
+# Anything larger than this is refused by put(), use share() instead
+SMALL_VALUE_MAX_BYTES = int(os.getenv("SESSION_SMALL_VALUE_MAX_BYTES", "1024"))
+
+# Byte budget for the shared store of heavy objects (all sessions together)
+SHARED_BYTE_BUDGET = int(os.getenv("SHARED_BYTE_BUDGET", str(256 * 1024 * 1024)))
+
+# Sessions not seen for this long are dropped from the memory report
+SESSION_IDLE_SECONDS = int(os.getenv("SESSION_IDLE_SECONDS", "3600"))
+
+# Write order of managed keys, oldest first (used to enforce the budget)
+_ORDER_KEY = "_managed_keys"
+
+
+class _SessionRegistry:
+    # Last known session state footprint for every session of this process
+
+    def __init__(self):
+        self._sessions: dict[str, tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, session_id: str, nbytes: int) -> None:
+        with self._lock:
+            self._sessions[session_id] = (nbytes, time.monotonic())
+
+    def snapshot(self) -> dict[str, int]:
+        cutoff = time.monotonic() - SESSION_IDLE_SECONDS
+        with self._lock:
+            for sid in [s for s, (_, seen) in self._sessions.items() if seen < cutoff]:
+                del self._sessions[sid]
+            return {sid: nbytes for sid, (nbytes, _) in self._sessions.items()}
+
+
+@st.cache_resource(show_spinner=False)
+def _shared_store() -> BoundedCache:
+    return BoundedCache(SHARED_BYTE_BUDGET)
+
+
+@st.cache_resource(show_spinner=False)
+def _registry() -> _SessionRegistry:
+    return _SessionRegistry()
+
+
+def _session_id() -> str:
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else "local"
+
+
+def _session_bytes() -> int:
+    return sum(estimate_bytes(k) + estimate_bytes(v) for k, v in st.session_state.items())
+
+
+def touch() -> None:
+    # Records the current session on every page run (called by core.ui.inject_css),
+    # so sessions that never write managed keys are counted too
+    if get_script_run_ctx() is not None:
+        _registry().record(_session_id(), _session_bytes())
+
+
+def put(key: str, value) -> None:
+    size = estimate_bytes(value)
+    if size > SMALL_VALUE_MAX_BYTES:
+        raise ValueError(
+            f"Session value {key!r} is {size} bytes, above the {SMALL_VALUE_MAX_BYTES} byte limit. "
+            "Store heavy objects with share() and keep only the key in session state."
+        )
+
+    st.session_state[key] = value
+    order = [k for k in st.session_state.get(_ORDER_KEY, []) if k != key] + [key]
+
+    # Over budget: drop the least recently written managed keys
+    total = _session_bytes()
+    while total > SESSION_BYTE_BUDGET and len(order) > 1:
+        st.session_state.pop(order.pop(0), None)
+        total = _session_bytes()
+
+    st.session_state[_ORDER_KEY] = order
+    _registry().record(_session_id(), total)
+
+
+def get(key: str, default=None):
+    return st.session_state.get(key, default)
+
+
+def pop(key: str, default=None):
+    value = st.session_state.pop(key, default)
+    order = st.session_state.get(_ORDER_KEY, [])
+    if key in order:
+        st.session_state[_ORDER_KEY] = [k for k in order if k != key]
+    _registry().record(_session_id(), _session_bytes())
+    return value
+
+
+def share(key: str, value) -> str:
+    # Heavy object goes to the shared store, the session only keeps its key
+    _shared_store().put(key, value, group="shared")
+    return key
+
+
+def get_shared(key: str, default=None):
+    return _shared_store().get(key, default)
+
+
+def session_memory_report() -> dict:
+    # Refresh the current session before reporting
+    touch()
+
+    sessions = _registry().snapshot()
+    return {
+        "sessions": len(sessions),
+        "session_bytes_total": sum(sessions.values()),
+        "session_bytes_max": max(sessions.values(), default=0),
+        "session_byte_budget": SESSION_BYTE_BUDGET,
+        "shared_bytes": _shared_store().total_bytes,
+        "shared_byte_budget": SHARED_BYTE_BUDGET,
+    }
@@ -1,8 +1,11 @@
 from __future__ import annotations
-from pathlib import Path
 
 import streamlit as st
 
+from core import state
+from core.bootstrap import STYLESHEET
+from core.data import club_logo_path
+
 
 def kpi_chip(label: str, value: str) -> None:
     st.markdown(
@@ -23,23 +26,29 @@ def kpi_chip(label: str, value: str) -> None:
         unsafe_allow_html=True,
     )
 
-# Club logo utilities
-CLUB_LOGO_DIR = Path(__file__).resolve().parents[1] / "assets" / "clubs"
 
-def render_club_logo_by_id(club_id, width: int = 40):
-    if club_id is None:
-        st.write("")
-        return
+# Shared stylesheet, read once per process and injected by every page
+@st.cache_resource(show_spinner=False)
+def stylesheet() -> str:
+    return STYLESHEET.read_text(encoding="utf-8")
+
 
-    cid = str(club_id).strip()
+@st.cache_resource(show_spinner=False)
+def stylesheet_html() -> str:
+    return "<style>" + stylesheet() + "</style>"
 
-    # Fix float-like ids from parquet/csv, "123.0" -> "123"
-    if cid.endswith(".0") and cid[:-2].isdigit():
-        cid = cid[:-2]
 
-    path = CLUB_LOGO_DIR / f"{cid}.png"
-    if path.exists():
-        st.image(str(path), width=width)
+def inject_css() -> None:
+    # Every page calls this first, the session is recorded for the memory report here
+    state.touch()
+    st.markdown(stylesheet_html(), unsafe_allow_html=True)
+
+
+# Club logo utilities
+def render_club_logo_by_id(club_id, width: int = 40):
+    path = club_logo_path(club_id)
+    if path:
+        st.image(path, width=width)
     else:
         st.write("")
 
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import pandas as pd
+from pandas.api import types as ptypes
+
+# Dataset validation
+#
+# Runs once per dataset version (see core.data.validation_report), not on page
+# reruns. Missing required columns or wrong dtypes are errors, the page cannot
+# render the dataset. Row level problems (duplicates, missing home or away row)
+# are warnings listing the affected match_ids, so a page can refuse only the
+# matches that are actually broken. match_id, matchday and club ID columns are
+# read as nullable integers (core.data.prepare_dataset), so float exports such
+# as 123.0 pass the integer check.
+
+KPI_METRICS = [
+    "players_used",
+    "players_available_for_match",
+    "usage_rate",
+    "pct_deployed",
+    "avg_age_used",
+    "weighted_age_used",
+    "avg_market_value_used",
+    "weighted_market_value_used",
+    "deployed_squad_market_value",
+]
+
+# Column -> expected kind: integer, numeric, datetime, string
+SCHEMAS = {
+    "matchday_overview_gold": {
+        "required": {
+            "match_id": "integer",
+            "matchday": "integer",
+            "home_club_id": "integer",
+            "away_club_id": "integer",
+        },
+        "optional": {
+            "match_date": "datetime",
+            "season": "string",
+            "competition": "string",
+            "result_string": "string",
+        },
+        "unique": ["match_id"],
+        "pairing": False,
+    },
+    "club_match_kpis_gold": {
+        "required": {
+            "match_id": "integer",
+            "club_id": "integer",
+            "club_side": "string",
+        },
+        "optional": {m: "numeric" for m in KPI_METRICS},
+        "unique": ["match_id", "club_side"],
+        "pairing": True,
+    },
+}
+
+SIDES = ("home", "away")
+
+
+@dataclass(frozen=True)
+class ValidationReport:
+    dataset_key: str
+    rows: int
+    errors: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+    duplicate_match_ids: frozenset[int] = frozenset()
+    unpaired_match_ids: frozenset[int] = frozenset()
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+def _has_kind(s: pd.Series, kind: str) -> bool:
+    if kind == "integer":
+        return ptypes.is_integer_dtype(s)
+    if kind == "numeric":
+        return ptypes.is_numeric_dtype(s) and not ptypes.is_bool_dtype(s)
+    if kind == "datetime":
+        return ptypes.is_datetime64_any_dtype(s)
+    if kind == "string":
+        return ptypes.is_string_dtype(s) or ptypes.is_object_dtype(s)
+    return True
+
+
+def key_columns(dataset_key: str) -> list[str]:
+    # Columns the row level checks need, enough to validate without the metrics
+    return list(SCHEMAS.get(dataset_key, {}).get("required", {}))
+
+
+def _ids(values) -> frozenset[int]:
+    return frozenset(int(v) for v in values if pd.notna(v))
+
+
+def validate(dataset_key: str, schema: pd.DataFrame, rows: pd.DataFrame) -> ValidationReport:
+    # schema: frame with every column and its dtype (may be empty)
+    # rows: all rows, with at least the required columns
+    spec = SCHEMAS.get(dataset_key)
+    if spec is None:
+        return ValidationReport(dataset_key, rows=len(rows))
+
+    errors: list[str] = []
+    warnings: list[str] = []
+
+    missing = [c for c in spec["required"] if c not in schema.columns]
+    if missing:
+        errors.append("missing required columns: " + ", ".join(missing))
+
+    for col, kind in spec["required"].items():
+        if col in schema.columns and not _has_kind(schema[col], kind):
+            errors.append(f"column {col} should be {kind}, got {schema[col].dtype}")
+    for col, kind in spec["optional"].items():
+        if col in schema.columns and not _has_kind(schema[col], kind):
+            warnings.append(f"column {col} should be {kind}, got {schema[col].dtype}")
+
+    if errors:
+        return ValidationReport(dataset_key, rows=len(rows), errors=errors, warnings=warnings)
+
+    nulls = rows[list(spec["required"])].isna().sum()
+    for col, n in nulls[nulls > 0].items():
+        warnings.append(f"{n} rows without {col}")
+
+    keyed = rows.dropna(subset=spec["unique"])
+    dup_mask = keyed.duplicated(spec["unique"], keep=False)
+    duplicate_ids = _ids(keyed.loc[dup_mask, "match_id"].unique())
+    if duplicate_ids:
+        warnings.append(f"{len(duplicate_ids)} match_ids with duplicate rows on ({', '.join(spec['unique'])})")
+
+    unpaired_ids: frozenset[int] = frozenset()
+    if spec["pairing"]:
+        # Compared as stored, pages select rows with club_side == "home" / "away"
+        sides = keyed["club_side"].astype("string")
+        unknown = keyed.loc[~sides.isin(SIDES), "club_side"].unique()
+        if len(unknown):
+            warnings.append("unknown club_side values: " + ", ".join(map(str, unknown[:10])))
+
+        # One row per side expected, counted for every match at once
+        counts = pd.crosstab(keyed["match_id"], sides).reindex(columns=list(SIDES), fill_value=0)
+        unpaired = counts.index[(counts["home"] == 0) | (counts["away"] == 0)]
+        unpaired_ids = _ids(unpaired)
+        if unpaired_ids:
+            warnings.append(f"{len(unpaired_ids)} match_ids without both a home and an away row")
+
+    return ValidationReport(
+        dataset_key,
+        rows=len(rows),
+        errors=errors,
+        warnings=warnings,
+        duplicate_match_ids=duplicate_ids,
+        unpaired_match_ids=unpaired_ids,
+    )
@@ -1,8 +1,9 @@
-from pathlib import Path
 import streamlit as st
 
-APP_DIR = Path(__file__).resolve().parents[1] # .../my_app
-logo_path = APP_DIR / "assets" / "laliga" / "laliga_logo.png"
+from core.bootstrap import bootstrap
+from core.ui import inject_css
+
+logo_path = bootstrap().paths.laliga_logo
 
 st.set_page_config(
     page_title="La Liga Squad Efficiency",
@@ -10,60 +11,7 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-st.markdown(
-    """
-    <style>
-      .hero {
-        border-radius: 22px;
-        padding: 25px 28px;
-        border: 1px solid rgba(255,255,255,0.12);
-        background: radial-gradient(900px 380px at 20% 10%, rgba(60,70,255,0.35), rgba(0,0,0,0)),
-                    radial-gradient(900px 380px at 90% 30%, rgba(225,6,0,0.35), rgba(0,0,0,0)),
-                    linear-gradient(135deg, rgba(12,16,44,0.90), rgba(70,10,55,0.85), rgba(85,5,20,0.85));
-        box-shadow: 0 20px 70px rgba(0,0,0,0.45);
-      }
-      .pill {
-        display: inline-block;
-        padding: 6px 12px;
-        border-radius: 999px;
-        font-size: 0.88rem;
-        font-weight: 700;
-        margin-right: 8px;
-        border: 1px solid rgba(255,255,255,0.18);
-        background: rgba(255,255,255,0.06);
-      }
-      .hero-title {
-        font-size: 2.6rem;
-        font-weight: 900;
-        margin: 12px 0 8px 0;
-        line-height: 1.05;
-      }
-      .hero-sub {
-        font-size: 1.05rem;
-        opacity: 0.85;
-        margin: 0 0 14px 0;
-        max-width: 62ch;
-      }
-      .hero-tip {
-        opacity: 0.78;
-        font-size: 0.95rem;
-        margin-top: 8px;
-      }
-      .section-title {
-        font-size: 1.6rem;
-        font-weight: 900;
-        margin-top: 26px;
-      }
-      .card {
-        border-radius: 18px;
-        padding: 16px 18px;
-        border: 1px solid rgba(255,255,255,0.10);
-        background: rgba(255,255,255,0.03);
-      }
-    </style>
-    """,
-    unsafe_allow_html=True,
-)
+inject_css()
 
 # Top row: LaLiga logo on the left, hero card on the right (same layout concept)
 left, right = st.columns([1, 3], vertical_alignment="center")
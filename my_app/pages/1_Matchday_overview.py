@@ -3,8 +3,9 @@ from __future__ import annotations
 import streamlit as st
 import pandas as pd
 
-from core.data import load_df
-from core.ui import kpi_chip, render_club_logo_by_id
+from core import query, state
+from core.data import join_clubs, parse_id, validation_report
+from core.ui import inject_css, kpi_chip, render_club_logo_by_id
 
 
 st.set_page_config(
@@ -16,101 +17,51 @@ st.set_page_config(
 st.title("Matchday Overview")
 
 # Helper functions
-def normalize_match_id(x) -> str:
-    if x is None:
-        return ""
-    s = str(x).strip()
-    if s.endswith(".0") and s[:-2].isdigit():
-        s = s[:-2]
-    return s
-
-
 def safe_str(x) -> str:
     if x is None:
         return ""
     s = str(x).strip()
-    if s.lower() == "nan":
+    # Missing values from join_clubs (pd.NA) or float columns render as empty
+    if s.lower() in ("nan", "<na>", "nat", "none"):
         return ""
     return s
 
 
-# -----------------------------
-# CSS for match cards
-# -----------------------------
-st.markdown(
-    """
-    <style>
-      .match-card {
-        border: 1px solid rgba(255,255,255,0.10);
-        background: rgba(255,255,255,0.03);
-        border-radius: 8px;
-        padding: 14px 14px;
-        margin: 10px 0px;
-      }
-      .muted {
-        opacity: 0.72;
-        font-size: 0.92rem;
-      }
-      .score {
-        font-weight: 800;
-        font-size: 1.25rem;
-        text-align: center;
-        letter-spacing: 0.5px;
-      }
-      .team-name {
-        font-weight: 700;
-        font-size: 1.05rem;
-        line-height: 1.1;
-      }
-      .right {
-        text-align: right;
-      }
-      .center {
-        text-align: center;
-      }
-    </style>
-    """,
-    unsafe_allow_html=True,
-)
+# Shared stylesheet (match cards)
+inject_css()
 
 # -----------------------------
 # Load data
 # -----------------------------
-df = load_df("matchday_overview_gold").copy()
-
-required_cols = ["match_id", "matchday", "home_club_name", "away_club_name"]
-missing = [c for c in required_cols if c not in df.columns]
-if missing:
-    st.error("matchday_overview_gold is missing required columns: " + ", ".join(missing))
+# Columns and dtypes are checked once per file version, reruns only read the report
+report = validation_report("matchday_overview_gold")
+if not report.ok:
+    st.error("matchday_overview_gold failed validation: " + "; ".join(report.errors))
     st.stop()
 
-# Optional but recommended for logos on this page
-logo_cols_needed = ["home_club_id", "away_club_id"]
-has_logo_cols = all(c in df.columns for c in logo_cols_needed)
-
-# Defensive normalize match_id for navigation keys
-df["match_id"] = df["match_id"].apply(normalize_match_id)
+# Filter values come from DuckDB, only the selected matchday is read into a frame
+options = query.matchdays()
 
 # Sidebar filters
 with st.sidebar:
     st.header("Filters")
 
-    if "season" in df.columns:
-        seasons = sorted([s for s in df["season"].dropna().unique().tolist()])
+    if "season" in options.columns:
+        seasons = sorted(options["season"].dropna().unique().tolist())
         season = st.selectbox("Season", seasons, index=len(seasons) - 1 if seasons else 0)
-        df = df[df["season"] == season]
+        options = options[options["season"] == season]
     else:
         season = None
 
-    if "competition" in df.columns:
-        comps = sorted([c for c in df["competition"].dropna().unique().tolist()])
+    if "competition" in options.columns:
+        comps = sorted(options["competition"].dropna().unique().tolist())
         competition = st.selectbox("Competition", ["All"] + comps, index=0)
         if competition != "All":
-            df = df[df["competition"] == competition]
+            options = options[options["competition"] == competition]
     else:
         competition = None
 
-    matchdays = sorted([int(x) for x in df["matchday"].dropna().unique().tolist()])
+    matchdays = sorted({int(x) for x in options["matchday"].dropna().tolist()})
     if not matchdays:
         st.warning("No matchdays found after filters.")
         st.stop()
@@ -118,17 +69,10 @@ with st.sidebar:
     default_md = matchdays[-1]
     matchday = st.selectbox("Matchday", matchdays, index=matchdays.index(default_md))
 
-# Filter matchday
-md = df[df["matchday"] == matchday].copy()
-
-# Sort by date/time when available
-sort_cols = []
-if "match_date" in md.columns:
-    sort_cols.append("match_date")
-if "kickoff_time" in md.columns:
-    sort_cols.append("kickoff_time")
-if sort_cols:
-    md = md.sort_values(sort_cols)
+# Rows of the matchday sorted by date/time, club names are joined for the displayed rows only
+md = join_clubs(
+    query.matchday_slice(matchday, season=season, competition=None if competition == "All" else competition)
+)
 
 # Header summary
 left, right = st.columns([3, 2], vertical_alignment="center")
@@ -152,23 +96,22 @@ with right:
             else:
                 kpi_chip("Dates", f"{pd.to_datetime(dmin):%Y-%m-%d} to {pd.to_datetime(dmax):%Y-%m-%d}")
 
-# If logo ids are missing, warn once (still renders)
-if not has_logo_cols:
-    st.info("Tip: Add home_club_id and away_club_id to matchday_overview_gold to display team logos on this page.")
-
 st.divider()
 
 # -----------------------------
 # Match cards
 # -----------------------------
 for _, r in md.iterrows():
-    match_id = normalize_match_id(r.get("match_id"))
+    # Rows without a match_id have nothing to open
+    match_id = parse_id(r.get("match_id"))
+    if match_id is None:
+        continue
 
-    home_name = safe_str(r.get("home_club_name", "Home"))
-    away_name = safe_str(r.get("away_club_name", "Away"))
+    home_name = safe_str(r.get("home_club_name")) or "Home"
+    away_name = safe_str(r.get("away_club_name")) or "Away"
 
-    home_id = r.get("home_club_id") if has_logo_cols else None
-    away_id = r.get("away_club_id") if has_logo_cols else None
+    home_id = r.get("home_club_id")
+    away_id = r.get("away_club_id")
 
     date_str = ""
     if "match_date" in md.columns and pd.notna(r.get("match_date")):
@@ -207,7 +150,7 @@ for _, r in md.iterrows():
 
     with c6:
         if st.button("View", key=f"view_{match_id}", use_container_width=True):
-            st.session_state["selected_match_id"] = match_id
+            state.put("selected_match_id", match_id)
             st.switch_page("pages/2_Match_analysis.py")
 
     st.markdown("</div>", unsafe_allow_html=True)
@@ -3,8 +3,10 @@ from __future__ import annotations
 import streamlit as st
 import pandas as pd
 
-from core.data import load_df
-from core.ui import render_club_logo_by_id, section_header
+from core import state
+from core.data import GOLD_KEYS, club_name, load_match_rows, parse_id, prefetch, validation_report
+from core.form import club_form, club_form_averages
+from core.ui import inject_css, render_club_logo_by_id, section_header
 
 
 st.set_page_config(
@@ -13,82 +15,9 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-st.markdown(
-    """
-    <style>
-      .match-header-card {
-        border: 1px solid rgba(255,255,255,0.10);
-        background: rgba(255,255,255,0.03);
-        border-radius: 8px;
-        padding: 10px 10px;
-        margin: 10px 0px 16px 0px;
-      }
-      .mh-team {
-        font-weight: 800;
-        font-size: 1.25rem;
-        line-height: 1.1;
-      }
-      .mh-score {
-        font-weight: 900;
-        font-size: 2.1rem;
-        text-align: center;
-        letter-spacing: 0.5px;
-      }
-      .mh-meta {
-        opacity: 0.72;
-        text-align: center;
-        margin-top: 6px;
-        font-size: 0.95rem;
-      }
-      .mh-right { text-align: right; }
-      .mh-left { text-align: left; }
-      .mh-center { text-align: center; }
-    </style>
-    """,
-    unsafe_allow_html=True,
-)
-
-st.markdown(
-    """
-    <style>
-      .score-chip {
-        display: inline-block;
-        padding: 5px 22px;
-        border-radius: 10px;
-        font-weight: 900;
-        font-size: 2.0rem;
-        letter-spacing: 1px;
-        border: 1px solid rgba(255,255,255,0.16);
-        background: linear-gradient(135deg, rgba(255,65,90,0.95), rgba(255,190,60,0.92));
-        box-shadow: 0 5px 55px rgba(0,0,0,0.45);
-      }
-      .meta-line {
-        opacity: 0.75;
-        margin-top: 10px;
-        font-size: 1.02rem;
-      }
-    </style>
-    """,
-    unsafe_allow_html=True,
-)
+inject_css()
 
 # Helpers
-def normalize_match_id(x) -> str:
-    if isinstance(x, list):
-        x = x[0] if len(x) else ""
-    if x is None:
-        return ""
-    s = str(x).strip()
-
-    # Fix float-like ids such as "123.0"
-    if s.endswith(".0"):
-        s2 = s[:-2]
-        if s2.isdigit():
-            s = s2
-
-    return s
-
-
 def comparison_row(label, left_val, right_val, fmt="{:.2f}"):
     c1, c2, c3 = st.columns([3, 2, 2], vertical_alignment="center")
 
@@ -179,32 +108,40 @@ def dual_ratio_bar(label: str, left_pct, right_pct, left_name: str, right_name:
     )
 
 # Read match_id from query params
-raw_match_id = st.session_state.get("selected_match_id")
+raw_match_id = state.get("selected_match_id")
 
 if not raw_match_id:
     raw_match_id = st.query_params.get("match_id")
 
-match_id = normalize_match_id(raw_match_id)
-
-if not match_id:
+if raw_match_id is None or not str(raw_match_id).strip():
     st.error("No match selected. Please go back to the Matchday page.")
     st.stop()
 
-st.query_params["match_id"] = match_id
+# Parsed once: float-like ids such as "123.0" are accepted, "123.5" or "inf" are not
+match_id = parse_id(raw_match_id)
+
+if match_id is None:
+    st.error("Invalid match_id: " + repr(raw_match_id))
+    st.stop()
+
+st.query_params["match_id"] = str(match_id)
 
 
-# Load data
-matches = load_df("matchday_overview_gold").copy()
-kpis = load_df("club_match_kpis_gold").copy()
+# Gold files read whole are loaded in parallel before the checks and row reads below
+prefetch(GOLD_KEYS)
 
-# Normalize match_id everywhere
-matches["match_id"] = matches["match_id"].apply(normalize_match_id)
-kpis["match_id"] = kpis["match_id"].apply(normalize_match_id)
+# Dataset checks run once per file version, reruns only read the reports
+match_report = validation_report("matchday_overview_gold")
+kpi_report = validation_report("club_match_kpis_gold")
 
+for report in (match_report, kpi_report):
+    if not report.ok:
+        st.error(f"{report.dataset_key} failed validation: " + "; ".join(report.errors))
+        st.stop()
 
-# Filter to selected match
-match_row = matches[matches["match_id"] == match_id]
-kpi_rows = kpis[kpis["match_id"] == match_id]
+# Load only the rows of the selected match (no full table load on deep links)
+match_row = load_match_rows("matchday_overview_gold", match_id)
+kpi_rows = load_match_rows("club_match_kpis_gold", match_id)
 
 # Defensive checks
 if match_row.empty:
@@ -215,28 +152,24 @@ if kpi_rows.empty:
     st.error("match_id not found in club_match_kpis_gold: " + repr(match_id))
     st.stop()
 
-if "club_side" not in kpi_rows.columns:
-    st.error("club_match_kpis_gold missing club_side column.")
+if match_id in kpi_report.unpaired_match_ids:
+    st.error("Expected one home row and one away row for match_id = " + repr(match_id))
     st.stop()
 
 home_rows = kpi_rows[kpi_rows["club_side"] == "home"]
 away_rows = kpi_rows[kpi_rows["club_side"] == "away"]
 
-if home_rows.empty or away_rows.empty:
-    st.error("Expected one home row and one away row for match_id = " + repr(match_id))
-    st.stop()
-
 # Use first row if duplicates exist
 home = home_rows.iloc[0]
 away = away_rows.iloc[0]
 match = match_row.iloc[0]
 
-home_name = str(home.get("club_name", match.get("home_club_name", "Home")))
-away_name = str(away.get("club_name", match.get("away_club_name", "Away")))
-
 home_id = match.get("home_club_id")
 away_id = match.get("away_club_id")
 
+home_name = club_name(home.get("club_id", home_id), default="Home")
+away_name = club_name(away.get("club_id", away_id), default="Away")
+
 
 # ------------------------------------------------
 # Page sections
@@ -244,7 +177,7 @@ away_id = match.get("away_club_id")
 
 # Header
 if st.button("← Back to Matchday selection"):
-    st.session_state["selected_match_id"] = None
+    state.pop("selected_match_id")
     st.switch_page("pages/1_Matchday_overview.py")
 
 st.title("Match Analysis")
@@ -401,3 +334,44 @@ comparison_row(
     away.get("deployed_squad_market_value"),
     fmt="{:,.0f}",
 )
+
+# Section: Recent form
+st.divider()
+section_header("Recent form")
+
+# The form index needs the full gold tables, so it is only built on request
+show_form = st.toggle("Show recent form", value=False, key="show_form")
+
+if show_form:
+    form_n = st.slider("Previous matches", min_value=3, max_value=10, value=5, key="form_window")
+
+    home_form = club_form(match_id, home.get("club_id"), form_n)
+    away_form = club_form(match_id, away.get("club_id"), form_n)
+
+    if home_form.empty and away_form.empty:
+        st.caption("No earlier matches in the dataset for these clubs.")
+    else:
+        home_avg = club_form_averages(match_id, home.get("club_id"), form_n)
+        away_avg = club_form_averages(match_id, away.get("club_id"), form_n)
+
+        form_metrics = [
+            ("Usage rate", "usage_rate", "{:.1%}"),
+            ("Share of squad deployed", "pct_deployed", "{:.1%}"),
+            ("Minutes weighted market value", "weighted_market_value_used", "{:,.0f}"),
+        ]
+
+        for label, col, fmt in form_metrics:
+            comparison_row(f"{label}, average", home_avg[col], away_avg[col], fmt=fmt)
+
+        # Align both clubs on "matches before this fixture", -1 is the latest
+        for label, col, _ in form_metrics:
+            timeline = pd.DataFrame(
+                {
+                    home_name: pd.Series(home_form[col].to_numpy(), index=range(-len(home_form), 0)),
+                    away_name: pd.Series(away_form[col].to_numpy(), index=range(-len(away_form), 0)),
+                }
+            )
+            st.caption(label)
+            st.line_chart(timeline, color=["#43ce15", "#ed4920"])
+
+        st.caption(f"Previous {form_n} matches of each club before this fixture, oldest first.")
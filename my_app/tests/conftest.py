@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+# Tests import the app modules the way the pages do ("from core.data import ...")
+
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parents[1]  # .../my_app
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
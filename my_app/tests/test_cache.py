@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import threading
+
+import pandas as pd
+import pytest
+
+import core.cache as cache_module
+from core.cache import BoundedCache, estimate_bytes
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(cache_module.time, "monotonic", fake)
+    return fake
+
+
+def test_estimate_bytes_uses_deep_memory_usage():
+    df = pd.DataFrame({"a": ["x" * 100] * 10})
+    assert estimate_bytes(df) == int(df.memory_usage(deep=True).sum())
+
+
+def test_budget_evicts_least_recently_used():
+    cache = BoundedCache(byte_budget=250)
+    cache.put("a", "A", nbytes=100)
+    cache.put("b", "B", nbytes=100)
+    assert cache.get("a") == "A"  # "b" is now the least recently used
+
+    cache.put("c", "C", nbytes=100)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+    assert cache.total_bytes == 200
+    assert [(e["key"], e["reason"]) for e in cache.eviction_log()] == [("b", "budget")]
+
+
+def test_entry_above_budget_is_kept_alone():
+    cache = BoundedCache(byte_budget=100)
+    cache.put("a", "A", nbytes=50)
+    cache.put("big", "B", nbytes=500)
+
+    assert cache.get("a") is None
+    assert cache.get("big") == "B"
+    assert cache.stats()["entries"] == 1
+
+
+def test_ttl_expiry_per_group(clock):
+    cache = BoundedCache(byte_budget=10_000, ttls={"short": 10}, default_ttl=100)
+    cache.put("s", "S", group="short", nbytes=1)
+    cache.put("d", "D", group="other", nbytes=1)
+
+    clock.now += 11
+    assert cache.get("s") is None
+    assert cache.get("d") == "D"
+
+    clock.now += 100
+    assert cache.get("d") is None
+    assert [(e["key"], e["reason"]) for e in cache.eviction_log()] == [("s", "ttl"), ("d", "ttl")]
+    assert cache.total_bytes == 0
+
+
+def test_get_or_load_reloads_after_ttl(clock):
+    cache = BoundedCache(byte_budget=10_000, ttls={"g": 5})
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return len(calls)
+
+    assert cache.get_or_load("k", loader, group="g") == 1
+    assert cache.get_or_load("k", loader, group="g") == 1
+    clock.now += 6
+    assert cache.get_or_load("k", loader, group="g") == 2
+
+
+def test_replace_group_drops_stale_versions():
+    cache = BoundedCache(byte_budget=10_000)
+    cache.put(("ds", 1), "v1", group="ds", replace_group=True, nbytes=10)
+    cache.put(("other", 1), "o", group="other", replace_group=True, nbytes=10)
+    cache.put(("ds", 2), "v2", group="ds", replace_group=True, nbytes=10)
+
+    assert cache.get(("ds", 1)) is None
+    assert cache.get(("ds", 2)) == "v2"
+    assert cache.get(("other", 1)) == "o"
+    assert [(e["key"], e["reason"]) for e in cache.eviction_log()] == [(("ds", 1), "stale")]
+
+
+def test_put_same_key_replaces_entry():
+    cache = BoundedCache(byte_budget=10_000)
+    cache.put("k", "old", nbytes=10)
+    cache.put("k", "new", nbytes=30)
+
+    assert cache.get("k") == "new"
+    assert cache.total_bytes == 30
+    assert cache.eviction_log()[-1]["reason"] == "replaced"
+
+
+def test_eviction_log_is_bounded():
+    cache = BoundedCache(byte_budget=10_000, log_size=3)
+    for i in range(5):
+        cache.put(i, i, nbytes=1)
+    cache.clear()
+
+    log = cache.eviction_log()
+    assert [e["key"] for e in log] == [2, 3, 4]
+    assert {e["reason"] for e in log} == {"cleared"}
+    assert cache.stats()["evictions"] == 5
+
+
+def test_failed_load_releases_lock_and_retries():
+    cache = BoundedCache(byte_budget=10_000)
+
+    def broken():
+        raise OSError("read failed")
+
+    with pytest.raises(OSError):
+        cache.get_or_load("k", broken)
+    assert cache._load_locks == {}
+
+    assert cache.get_or_load("k", lambda: "ok") == "ok"
+    assert cache._load_locks == {}
+
+
+def test_concurrent_get_or_load_runs_loader_once():
+    cache = BoundedCache(byte_budget=10_000)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_loader():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "value"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("k", slow_loader))) for _ in range(4)]
+    threads[0].start()
+    started.wait(5)
+    for t in threads[1:]:
+        t.start()
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert calls == [1]
+    assert results == ["value"] * 4
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from unittest import mock
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+import core.data as data
+from core.cache import BoundedCache
+from core.data import _read_match_rows, club_logo_path, club_name, parse_id, prepare_dataset
+from core.validation import validate
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("4645785", 4645785),
+        ("4645785.0", 4645785),
+        (" 12 ", 12),
+        (12.0, 12),
+        (["7"], 7),
+        ("4645785.5", None),
+        ("inf", None),
+        ("nan", None),
+        ("abc", None),
+        ("", None),
+        ([], None),
+        (None, None),
+        (pd.NA, None),
+        (float("nan"), None),
+    ],
+)
+def test_parse_id(value, expected):
+    assert parse_id(value) == expected
+
+
+def test_club_lookups_accept_float_like_text_ids():
+    # The shipped data has a logo and a name for club 131
+    assert club_logo_path("131.0") == club_logo_path(131)
+    assert club_logo_path("131.0") is not None
+    assert club_name(131.0) == club_name("131")
+    assert club_name("abc", default="Home") == "Home"
+    assert club_logo_path(pd.NA) is None
+
+
+def test_read_match_rows_decodes_only_its_row_groups(tmp_path):
+    kpis = pd.DataFrame(
+        {
+            "match_id": [1, 1, 2, 2, 3, 3],
+            "club_id": [10, 20, 30, 40, 50, 60],
+            "club_side": ["home", "away"] * 3,
+            "usage_rate": [0.1, 0.2, 0.3, 0.4, 0.5, 0.6],
+        }
+    )
+    path = tmp_path / "club_match_kpis_gold.parquet"
+    kpis.to_parquet(path, row_group_size=2)
+
+    read = []
+    original = pq.ParquetFile.read_row_group
+
+    def spy(self, i, *args, **kwargs):
+        if kwargs.get("columns") is None:
+            read.append(i)
+        return original(self, i, *args, **kwargs)
+
+    with mock.patch.object(pq.ParquetFile, "read_row_group", spy):
+        rows = _read_match_rows(path, "club_match_kpis_gold", 2)
+        missing = _read_match_rows(path, "club_match_kpis_gold", 99)
+
+    assert read == [1]
+    assert rows["club_id"].tolist() == [30, 40]
+    assert missing.empty
+    assert list(missing.columns) == list(rows.columns)
+
+
+def test_float_ids_pass_validation_after_prepare():
+    # Float exports (e.g. a csv with a blank matchday) were accepted before validation existed
+    matches = pd.DataFrame(
+        {
+            "match_id": [1.0, 2.0, 3.0],
+            "matchday": [1.0, None, 1.0],
+            "home_club_id": [10.0, 30.0, 50.0],
+            "away_club_id": [20.0, 40.0, 60.0],
+        }
+    )
+    df = prepare_dataset(matches, "matchday_overview_gold")
+    report = validate("matchday_overview_gold", df.iloc[0:0], df)
+
+    assert report.ok, report.errors
+    assert str(df["match_id"].dtype) == "Int64"
+    assert report.warnings == ["1 rows without matchday"]
+
+
+def test_cold_validation_report_validates_once(tmp_path, monkeypatch):
+    processed = tmp_path / "processed"
+    processed.mkdir()
+    pd.DataFrame(
+        {
+            "match_id": [1, 1],
+            "club_id": [10, 20],
+            "club_side": ["home", "away"],
+            "usage_rate": [0.1, 0.2],
+        }
+    ).to_parquet(processed / "club_match_kpis_gold.parquet")
+
+    cache = BoundedCache(1024 * 1024)
+    calls = []
+    monkeypatch.setenv("DATA_ROOT", str(tmp_path))
+    monkeypatch.setattr(data, "_RESOLVED", {})
+    monkeypatch.setattr(data, "_MISSING", {})
+    monkeypatch.setattr(data, "dataset_cache", lambda: cache)
+    monkeypatch.setattr(data, "validate", lambda *args: calls.append(args[0]) or validate(*args))
+
+    # A single row group file is read whole, the report stored by that read is reused
+    report = data.validation_report("club_match_kpis_gold")
+    assert calls == ["club_match_kpis_gold"]
+    assert report.ok, report.errors
+    assert data.validation_report("club_match_kpis_gold") is report
+    assert calls == ["club_match_kpis_gold"]
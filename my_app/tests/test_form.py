@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import core.form as form
+from core.form import FORM_METRICS, build_form_index
+
+
+@pytest.fixture
+def index(monkeypatch):
+    # Club 10 plays matches 1-4, club 20 plays 1, 2 and the undated match 5
+    kpis = pd.DataFrame(
+        {
+            "match_id": [1, 2, 3, 4, 1, 2, 5],
+            "club_id": [10, 10, 10, 10, 20, 20, 20],
+            "usage_rate": [0.1, np.nan, 0.3, 0.4, 0.5, 0.6, 0.7],
+            "pct_deployed": [0.2, 0.2, 0.2, 0.2, np.nan, np.nan, 0.9],
+        }
+    ).astype({"match_id": "Int64", "club_id": "Int64"})
+    matches = pd.DataFrame(
+        {
+            "match_id": pd.array([4, 3, 2, 1, 5], dtype="Int64"),
+            "match_date": pd.to_datetime(["2025-09-01", "2025-08-25", "2025-08-18", "2025-08-11", None]),
+        }
+    )
+    built = build_form_index(kpis, matches)
+    monkeypatch.setattr(form, "load_form_index", lambda: built)
+    return built
+
+
+def test_index_is_sorted_by_club_and_date_without_undated_rows(index):
+    assert index.frame["club_id"].tolist() == [10, 10, 10, 10, 20, 20]
+    assert index.frame["match_id"].tolist() == [1, 2, 3, 4, 1, 2]
+    assert index.block_start.tolist() == [0, 0, 0, 0, 4, 4]
+    assert (5, 20) not in index.positions
+
+
+def test_window_stops_at_club_block_boundary(index):
+    # The first match of club 20 directly follows club 10's rows
+    assert form._window(index, 1, 20, 5) == (4, 4)
+    assert form.club_form(1, 20, 5).empty
+    assert form.club_form(2, 20, 5)["match_id"].tolist() == [1]
+
+
+def test_window_larger_than_history(index):
+    assert form.club_form(4, 10, 10)["match_id"].tolist() == [1, 2, 3]
+    assert form.club_form(4, 10, 2)["match_id"].tolist() == [2, 3]
+
+
+def test_undated_fixture_has_no_window(index):
+    assert form.club_form(5, 20, 5).empty
+    assert all(math.isnan(v) for v in form.club_form_averages(5, 20, 5).values())
+
+
+def test_averages_ignore_missing_values(index):
+    avg = form.club_form_averages(4, 10, 3)
+    assert set(avg) == set(FORM_METRICS)
+    assert avg["usage_rate"] == pytest.approx(0.2)  # 0.1 and 0.3, match 2 is missing
+    assert avg["pct_deployed"] == pytest.approx(0.2)
+    assert math.isnan(avg["weighted_market_value_used"])  # column absent
+
+    # Only missing values in the window
+    assert math.isnan(form.club_form_averages(2, 20, 5)["pct_deployed"])
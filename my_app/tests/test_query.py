@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import os
+
+import pandas as pd
+import pytest
+
+import core.data as data
+import core.query as query
+from core.cache import BoundedCache
+
+
+@pytest.fixture
+def gold_dir(tmp_path, monkeypatch):
+    # Gold files without the optional season column, in a fresh engine and cache
+    processed = tmp_path / "processed"
+    processed.mkdir()
+    pd.DataFrame(
+        {
+            "match_id": [1, 2, 3],
+            "matchday": [1, 1, 2],
+            "competition": ["LaLiga", "LaLiga", "LaLiga"],
+            "match_date": pd.to_datetime(["2025-08-16", "2025-08-15", "2025-08-23"]),
+            "home_club_id": [10, 30, 20],
+            "away_club_id": [20, 40, 10],
+        }
+    ).to_parquet(processed / "matchday_overview_gold.parquet")
+    write_kpis(processed, usage_rate=[0.5, 0.7, 0.6, 0.2])
+
+    cache = BoundedCache(1024 * 1024)
+    engine = query._Engine()
+    monkeypatch.setenv("DATA_ROOT", str(tmp_path))
+    monkeypatch.setattr(data, "_RESOLVED", {})
+    monkeypatch.setattr(data, "_MISSING", {})
+    monkeypatch.setattr(query, "dataset_cache", lambda: cache)
+    monkeypatch.setattr(query, "_engine", lambda: engine)
+    return processed
+
+
+def write_kpis(processed, usage_rate):
+    pd.DataFrame(
+        {
+            "match_id": [1, 1, 2, 2],
+            "club_id": [10, 20, 30, 40],
+            "club_side": ["away", "home", "home", "away"],
+            "usage_rate": usage_rate,
+        }
+    ).to_parquet(processed / "club_match_kpis_gold.parquet")
+
+
+def test_matchdays_and_slice_skip_missing_season(gold_dir):
+    options = query.matchdays()
+    assert list(options.columns) == ["competition", "matchday"]
+    assert options["matchday"].tolist() == [1, 2]
+
+    md = query.matchday_slice(1, season="2025/26", competition="LaLiga")
+    # Sorted by date, the season filter is dropped as the column is absent
+    assert md["match_id"].tolist() == [2, 1]
+    assert str(md["match_id"].dtype) == "Int64"
+    assert query.matchday_slice(1, competition="Copa").empty
+
+
+def test_match_sheet_orders_home_first(gold_dir):
+    sheet = query.match_sheet(1)
+    assert sheet["club_side"].tolist() == ["home", "away"]
+    assert sheet["club_id"].tolist() == [20, 10]
+
+
+def test_club_season_aggregates_without_season_or_optional_metrics(gold_dir):
+    agg = query.club_season_aggregates(season="2025/26")
+    assert list(agg.columns) == ["club_id", "matches", "avg_usage_rate"]
+    assert agg["club_id"].tolist() == [10, 20, 30, 40]
+    assert agg["avg_usage_rate"].tolist() == pytest.approx([0.5, 0.7, 0.6, 0.2])
+
+
+def test_new_file_version_replaces_cached_result(gold_dir):
+    assert query.match_sheet(2)["usage_rate"].tolist() == pytest.approx([0.6, 0.2])
+
+    path = gold_dir / "club_match_kpis_gold.parquet"
+    mtime = path.stat().st_mtime_ns
+    write_kpis(gold_dir, usage_rate=[0.5, 0.7, 0.9, 0.1])
+    os.utime(path, ns=(mtime + 1_000_000_000, mtime + 1_000_000_000))
+
+    assert query.match_sheet(2)["usage_rate"].tolist() == pytest.approx([0.9, 0.1])
+    cache = query.dataset_cache()
+    assert [e["reason"] for e in cache.eviction_log()] == ["stale"]
+    assert cache.stats()["entries"] == 1
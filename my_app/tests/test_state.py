@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import pytest
+
+import core.state as state
+from core.cache import BoundedCache
+
+
+@pytest.fixture
+def session(monkeypatch) -> dict:
+    # A plain dict stands in for st.session_state, with a fresh registry and shared store
+    fake: dict = {}
+    registry = state._SessionRegistry()
+    store = BoundedCache(1024 * 1024)
+    monkeypatch.setattr(state.st, "session_state", fake)
+    monkeypatch.setattr(state, "_registry", lambda: registry)
+    monkeypatch.setattr(state, "_shared_store", lambda: store)
+    return fake
+
+
+def test_put_refuses_values_above_small_value_limit(session, monkeypatch):
+    monkeypatch.setattr(state, "SMALL_VALUE_MAX_BYTES", 100)
+
+    with pytest.raises(ValueError, match="share()"):
+        state.put("big", "x" * 500)
+    assert "big" not in session
+
+
+def test_put_evicts_oldest_managed_keys_over_budget(session, monkeypatch):
+    monkeypatch.setattr(state, "SMALL_VALUE_MAX_BYTES", 1000)
+    monkeypatch.setattr(state, "SESSION_BYTE_BUDGET", 1500)
+
+    for key in ("a", "b", "c"):
+        state.put(key, "x" * 400)
+
+    # Three values no longer fit once "c" is written: "a" (oldest) goes first
+    assert "a" not in session
+    assert session["b"] == "x" * 400
+    assert session["c"] == "x" * 400
+    assert session[state._ORDER_KEY] == ["b", "c"]
+
+    # Rewriting "b" makes it the newest, the next eviction takes "c"
+    state.put("b", "y" * 400)
+    state.put("d", "x" * 400)
+    assert "c" not in session
+    assert session[state._ORDER_KEY] == ["b", "d"]
+
+
+def test_pop_updates_order_and_report(session):
+    state.put("selected_match_id", "4645785")
+    assert state.pop("selected_match_id") == "4645785"
+    assert state.get("selected_match_id") is None
+    assert session[state._ORDER_KEY] == []
+
+    report = state.session_memory_report()
+    assert report["sessions"] == 1
+    assert report["session_bytes_total"] == report["session_bytes_max"]
+
+
+def test_share_keeps_heavy_objects_out_of_session(session):
+    key = state.share("matchday:1", list(range(10_000)))
+    state.put("slice_key", key)
+
+    assert state.get_shared(state.get("slice_key")) == list(range(10_000))
+    assert state.session_memory_report()["shared_bytes"] > state.SMALL_VALUE_MAX_BYTES
@@ -0,0 +1,428 @@
+from __future__ import annotations
+
+# Static snapshot export of the dashboard.
+#
+# Renders every matchday overview and every match analysis into plain HTML,
+# using the same stylesheet (assets/styles.css via core.ui) and the same gold tables (core.data) as the
+# Streamlit pages, so peak traffic can be served from a static file server.
+#
+# Run from within the "my_app" folder:
+#   python -m tools.export_static --out build/static
+#
+# Only matchdays whose source rows changed since the last export are rendered
+# again. Use --force to rebuild everything. Pages of matchdays or matches that
+# are no longer in the data are removed.
+
+import argparse
+import hashlib
+import html
+import json
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+APP_DIR = Path(__file__).resolve().parents[1]  # .../my_app
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from core.data import CLUB_LOGO_DIR, join_clubs, load_clubs, load_many, parse_id  # noqa: E402
+from core.ui import stylesheet  # noqa: E402
+
+MANIFEST_NAME = "manifest.json"
+
+# Colors and font follow .streamlit/config.toml
+BASE_CSS = """
+  body {
+    margin: 0;
+    background: #0d0505;
+    color: #FFFFFF;
+    font-family: sans-serif;
+  }
+  a { color: #23bab3; }
+  .page { max-width: 1100px; margin: 0 auto; padding: 24px 28px 48px 28px; }
+  .row { display: flex; align-items: center; gap: 12px; }
+  .row > .grow { flex: 1; }
+  .logo { display: block; }
+  .btn {
+    display: inline-block;
+    padding: 6px 14px;
+    border-radius: 8px;
+    border: 1px solid rgba(255,255,255,0.18);
+    text-decoration: none;
+    color: #FFFFFF;
+  }
+  .section {
+    border-left: 6px solid #FF4B44;
+    padding-left: 12px;
+    margin-top: 28px;
+  }
+  table.cmp { width: 100%; border-collapse: collapse; }
+  table.cmp td { padding: 6px 4px; }
+  table.cmp td.home { color: #43ce15ff; font-weight: 700; }
+  table.cmp td.away { color: #ed4920ff; font-weight: 700; }
+  .cols { display: flex; gap: 16px; }
+  .cols > div { flex: 1; }
+  .caption { opacity: 0.6; font-size: 0.875rem; margin: 2px 0; }
+  .progress { height: 8px; border-radius: 4px; background: #111133; overflow: hidden; margin: 6px 0; }
+  .progress > div { height: 100%; background: #23bab3ff; }
+  hr { border: 0; border-top: 1px solid rgba(255,255,255,0.12); margin: 20px 0; }
+"""
+
+PAGE_CSS = BASE_CSS + stylesheet()
+
+# Changes to the stylesheet must invalidate every previously rendered page
+TEMPLATE_VERSION = hashlib.sha1(PAGE_CSS.encode("utf-8")).hexdigest()[:12]
+
+
+# Helpers
+def safe_str(x) -> str:
+    if x is None:
+        return ""
+    s = str(x).strip()
+    if s.lower() in ("nan", "<na>", "nat", "none"):
+        return ""
+    return s
+
+
+def esc(x) -> str:
+    return html.escape(safe_str(x))
+
+
+def slug(x) -> str:
+    s = safe_str(x)
+    return "".join(ch if ch.isalnum() else "-" for ch in s).strip("-") or "all"
+
+
+def matchday_filename(season, matchday) -> str:
+    return f"matchday/{slug(season)}-{int(matchday)}.html"
+
+
+def match_filename(match_id) -> str:
+    return f"match/{parse_id(match_id)}.html"
+
+
+def page_html(title: str, body: str, depth: int) -> str:
+    home = "../" * depth + "index.html"
+    return (
+        "<!doctype html>\n"
+        "<html lang='en'><head><meta charset='utf-8'>"
+        "<meta name='viewport' content='width=device-width, initial-scale=1'>"
+        f"<title>{html.escape(title)}</title>"
+        f"<style>{PAGE_CSS}</style></head>"
+        f"<body><div class='page'><p><a href='{home}'>La Liga Squad Efficiency</a></p>"
+        f"{body}</div></body></html>\n"
+    )
+
+
+def logo_html(path, width: int, depth: int) -> str:
+    if not isinstance(path, str) or not path:
+        return f"<div style='width:{width}px'></div>"
+    src = "../" * depth + f"assets/clubs/{Path(path).name}"
+    return f"<img class='logo' src='{src}' width='{width}' alt=''>"
+
+
+def fmt_value(x, fmt: str) -> str:
+    if x is None or pd.isna(x):
+        return "-"
+    return html.escape(fmt.format(x))
+
+
+def clamp01(x) -> float:
+    try:
+        x = float(x)
+    except Exception:
+        return 0.0
+    if x != x:  # NaN
+        return 0.0
+    return max(0.0, min(1.0, x))
+
+
+# Matchday overview
+def render_matchday(season, matchday, md: pd.DataFrame) -> str:
+    sort_cols = [c for c in ("match_date", "kickoff_time") if c in md.columns]
+    if sort_cols:
+        md = md.sort_values(sort_cols)
+
+    title_bits = [safe_str(season)] if safe_str(season) else []
+    title_bits.append(f"Matchday {int(matchday)}")
+
+    cards = []
+    for _, r in md.iterrows():
+        date_str = ""
+        if "match_date" in md.columns and pd.notna(r.get("match_date")):
+            date_str = pd.to_datetime(r["match_date"]).strftime("%a %Y-%m-%d")
+        score = esc(r.get("result_string", "")) or "-"
+        href = "../" + match_filename(r.get("match_id"))
+
+        cards.append(
+            "<div class='match-card'><div class='row'>"
+            f"<div style='width:120px'><div class='muted'>{html.escape(date_str)}</div>"
+            f"<div class='muted'>{esc(r.get('kickoff_time', ''))}</div></div>"
+            f"{logo_html(r.get('home_logo_path'), 60, 1)}"
+            f"<div class='grow team-name right'>{esc(r.get('home_club_name', 'Home'))}</div>"
+            f"<div class='score' style='width:80px'>{score}</div>"
+            f"<div class='grow team-name'>{esc(r.get('away_club_name', 'Away'))}</div>"
+            f"{logo_html(r.get('away_logo_path'), 60, 1)}"
+            f"<a class='btn' href='{href}'>View</a>"
+            "</div></div>"
+        )
+
+    body = (
+        "<h1>Matchday Overview</h1>"
+        f"<h3>{html.escape(' , '.join(title_bits))}</h3>"
+        f"<p class='muted'>Matches: {len(md)}</p><hr>"
+        + "".join(cards)
+    )
+    return page_html(f"Matchday {int(matchday)}, La Liga Squad Efficiency", body, depth=1)
+
+
+# Match analysis
+def comparison_rows(rows, home: pd.Series, away: pd.Series) -> str:
+    out = []
+    for label, col, fmt in rows:
+        out.append(
+            f"<tr><td>{html.escape(label)}</td>"
+            f"<td class='home'>{fmt_value(home.get(col), fmt)}</td>"
+            f"<td class='away'>{fmt_value(away.get(col), fmt)}</td></tr>"
+        )
+    return "<table class='cmp'>" + "".join(out) + "</table>"
+
+
+def progress_bar(label: str, left_pct, right_pct, left_name: str, right_name: str) -> str:
+    # Same layout as dual_progress_bar in Match analysis: one st.progress per club
+    def side(name, pct):
+        caption = f"<div class='caption'>{pct:.1%}</div>" if pct is not None and pd.notna(pct) else ""
+        return (
+            f"<div><div class='caption'>{html.escape(name)}</div>"
+            f"<div class='progress'><div style='width:{clamp01(pct) * 100:.2f}%'></div></div>"
+            f"{caption}</div>"
+        )
+
+    return f"<p>{html.escape(label)}</p><div class='cols'>{side(left_name, left_pct)}{side(right_name, right_pct)}</div>"
+
+
+def render_match(match: pd.Series, kpi_rows: pd.DataFrame, season, matchday) -> str | None:
+    home_rows = kpi_rows[kpi_rows["club_side"] == "home"]
+    away_rows = kpi_rows[kpi_rows["club_side"] == "away"]
+    if home_rows.empty or away_rows.empty:
+        return None
+
+    home = home_rows.iloc[0]
+    away = away_rows.iloc[0]
+    home_name = safe_str(home.get("club_name", match.get("home_club_name", "Home"))) or "Home"
+    away_name = safe_str(away.get("club_name", match.get("away_club_name", "Away"))) or "Away"
+
+    score_str = esc(match.get("result_string", "")) or "-"
+    date_str = ""
+    if pd.notna(match.get("match_date")):
+        date_str = pd.to_datetime(match["match_date"]).strftime("%d %b %Y")
+    meta_line = " , ".join(b for b in [date_str, safe_str(match.get("kickoff_time", ""))] if b)
+
+    back = "../" + matchday_filename(season, matchday)
+
+    body = (
+        f"<p><a class='btn' href='{back}'>← Back to Matchday selection</a></p>"
+        "<h1>Match Analysis</h1>"
+        "<div class='match-header-card'><div class='row'>"
+        f"{logo_html(match.get('home_logo_path'), 100, 1)}"
+        f"<div class='grow mh-team mh-right'>{html.escape(home_name)}</div>"
+        f"<div style='width:220px'><div class='mh-center'><span class='score-chip'>{score_str}</span></div>"
+        f"<div class='mh-center meta-line'>{html.escape(meta_line)}</div></div>"
+        f"<div class='grow mh-team mh-left'>{html.escape(away_name)}</div>"
+        f"{logo_html(match.get('away_logo_path'), 100, 1)}"
+        "</div></div><hr>"
+        "<h3 class='section'>Squad availability</h3>"
+        + comparison_rows(
+            [
+                ("Total squad players", "players_total_squad", "{:.0f}"),
+                ("Players available", "players_available_for_match", "{:.0f}"),
+                ("Players used", "players_used", "{:.0f}"),
+                ("Usage rate", "usage_rate", "{:.1%}"),
+            ],
+            home,
+            away,
+        )
+        + "<hr><h3 class='section'>Squad utilization ratios</h3>"
+        + progress_bar("Share of squad available", home.get("pct_available"), away.get("pct_available"), home_name, away_name)
+        + progress_bar("Share of squad in matchday squad", home.get("pct_matchday"), away.get("pct_matchday"), home_name, away_name)
+        + progress_bar("Share of squad deployed", home.get("pct_deployed"), away.get("pct_deployed"), home_name, away_name)
+        + "<p class='muted'>Ratios are expressed as a share of the registered squad. "
+        "Deployed players are those who played at least one minute.</p>"
+        "<hr><h3 class='section'>Age profile</h3>"
+        + comparison_rows(
+            [
+                ("Average age", "avg_age_used", "{:.2f}"),
+                ("Minutes weighted age", "weighted_age_used", "{:.2f}"),
+            ],
+            home,
+            away,
+        )
+        + "<hr><h3 class='section'>Market value</h3>"
+        + comparison_rows(
+            [
+                ("Average market value", "avg_market_value_used", "{:,.0f}"),
+                ("Minutes weighted market value", "weighted_market_value_used", "{:,.0f}"),
+                ("Deployed squad market value", "deployed_squad_market_value", "{:,.0f}"),
+            ],
+            home,
+            away,
+        )
+    )
+    return page_html(f"{home_name} vs {away_name}, Match Analysis", body, depth=1)
+
+
+# Worker: one job per matchday, writes the overview and all its match pages
+def render_matchday_job(job: tuple) -> tuple[str, list[str]]:
+    group_key, season, matchday, md, kpis, out_dir = job
+    out = Path(out_dir)
+
+    written = [matchday_filename(season, matchday)]
+    target = out / written[0]
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(render_matchday(season, matchday, md), encoding="utf-8")
+
+    (out / "match").mkdir(parents=True, exist_ok=True)
+    for _, match in md.iterrows():
+        mid = parse_id(match.get("match_id"))
+        page = render_match(match, kpis[kpis["match_id"] == mid], season, matchday)
+        if page is None:
+            continue
+        (out / match_filename(mid)).write_text(page, encoding="utf-8")
+        written.append(match_filename(mid))
+
+    return group_key, written
+
+
+def render_index(groups: list[tuple[str, object, int]]) -> str:
+    items = "".join(
+        f"<li><a href='{matchday_filename(season, matchday)}'>"
+        f"{esc(season)} , Matchday {int(matchday)}</a></li>"
+        for _, season, matchday in groups
+    )
+    body = "<h1>La Liga Squad Efficiency</h1><h3>Matchdays</h3><ul>" + items + "</ul>"
+    return page_html("La Liga Squad Efficiency", body, depth=0)
+
+
+def group_fingerprint(md: pd.DataFrame, kpis: pd.DataFrame) -> str:
+    h = hashlib.sha1(TEMPLATE_VERSION.encode("utf-8"))
+    for part in (md, kpis):
+        part = part.sort_index(axis=1).reset_index(drop=True)
+        h.update(",".join(map(str, part.columns)).encode("utf-8"))
+        h.update(pd.util.hash_pandas_object(part, index=False).values.tobytes())
+    return h.hexdigest()
+
+
+def read_manifest(out: Path) -> dict:
+    p = out / MANIFEST_NAME
+    if not p.exists():
+        return {}
+    try:
+        return json.loads(p.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def remove_stale_pages(out: Path, keep: set[str]) -> int:
+    # Pages of matchdays or matches that left the data must not stay servable
+    removed = 0
+    for folder in ("matchday", "match"):
+        for p in (out / folder).glob("*.html"):
+            if p.relative_to(out).as_posix() not in keep:
+                p.unlink()
+                removed += 1
+    return removed
+
+
+def copy_logos(out: Path) -> None:
+    dest = out / "assets" / "clubs"
+    dest.mkdir(parents=True, exist_ok=True)
+    for src in CLUB_LOGO_DIR.glob("*.png"):
+        target = dest / src.name
+        if not target.exists() or target.stat().st_mtime < src.stat().st_mtime:
+            shutil.copy2(src, target)
+
+
+def export(out: Path, workers: int | None = None, force: bool = False) -> dict:
+    datasets = load_many(["matchday_overview_gold", "club_match_kpis_gold"])
+    matches = join_clubs(datasets["matchday_overview_gold"])
+    kpis = join_clubs(datasets["club_match_kpis_gold"])
+
+    # Logo paths resolved here, workers only format HTML
+    logos = load_clubs()["logo_path"]
+    matches["home_logo_path"] = matches["home_club_id"].map(logos)
+    matches["away_logo_path"] = matches["away_club_id"].map(logos)
+    # match_id is a nullable integer after load, rows without one have no page
+    matches = matches[matches["match_id"].notna() & matches["matchday"].notna()]
+    kpis = kpis[kpis["match_id"].notna()]
+    if "season" not in matches.columns:
+        matches["season"] = ""
+
+    # One job per (season, matchday), with the kpi rows of its matches
+    jobs = []
+    groups = []
+    fingerprints = {}
+    for (season, matchday), md in matches.groupby(["season", "matchday"], sort=True, dropna=False):
+        group_key = f"{slug(season)}-{int(matchday)}"
+        md_kpis = kpis[kpis["match_id"].isin(md["match_id"])]
+        groups.append((group_key, season, matchday))
+        fingerprints[group_key] = group_fingerprint(md, md_kpis)
+        jobs.append((group_key, season, matchday, md, md_kpis, str(out)))
+
+    manifest = {} if force else read_manifest(out)
+    previous = manifest.get("matchdays", {})
+    previous_files = manifest.get("files", {})
+    stale = [
+        j for j in jobs
+        if previous.get(j[0]) != fingerprints[j[0]]
+        or j[0] not in previous_files
+        or not (out / matchday_filename(j[1], j[2])).exists()
+    ]
+
+    out.mkdir(parents=True, exist_ok=True)
+    copy_logos(out)
+
+    # Pages of every current matchday, from this run or the previous manifest
+    files = {key: previous_files[key] for key in fingerprints if key in previous_files}
+    written = 0
+    if stale:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for group_key, paths in pool.map(render_matchday_job, stale):
+                files[group_key] = paths
+                written += len(paths)
+
+    removed = remove_stale_pages(out, {p for paths in files.values() for p in paths})
+
+    (out / "index.html").write_text(render_index(groups), encoding="utf-8")
+    manifest = {"template_version": TEMPLATE_VERSION, "matchdays": fingerprints, "files": files}
+    (out / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+
+    return {
+        "matchdays": len(jobs),
+        "rebuilt": len(stale),
+        "skipped": len(jobs) - len(stale),
+        "files_written": written,
+        "files_removed": removed,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Export the dashboard as static HTML.")
+    parser.add_argument("--out", default=str(APP_DIR / "build" / "static"), help="Output folder")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Rebuild every matchday")
+    args = parser.parse_args(argv)
+
+    stats = export(Path(args.out).resolve(), workers=args.workers, force=args.force)
+    print(
+        f"Exported {stats['matchdays']} matchdays to {args.out}: "
+        f"{stats['rebuilt']} rebuilt, {stats['skipped']} unchanged, "
+        f"{stats['files_written']} pages written, {stats['files_removed']} stale pages removed."
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,369 @@
+from __future__ import annotations
+
+# Local load test of the dashboard.
+#
+# Starts one "streamlit run app.py" server and drives many sessions against it
+# at the same time with headless websocket clients, speaking the same protocol
+# as the browser (BackMsg / ForwardMsg protobufs on /_stcore/stream). Every
+# session follows the real navigation: open the app (redirects to the
+# homepage), click "START EXPLORING", pick a matchday on the overview, click
+# "View" and land on Match analysis.
+#
+# All sessions share the server's data caches and session registry,
+# so the report shows the latency and RSS of that one server under concurrent
+# load. The RSS is sampled from /proc (Linux) while the test runs.
+#
+# Run from within the "my_app" folder:
+#   python -m tools.load_test --sessions 200 --concurrency 20
+# or against a server that is already running:
+#   python -m tools.load_test --url http://localhost:8501 --server-pid 12345
+
+import argparse
+import asyncio
+import json
+import os
+from pathlib import Path
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from tornado.websocket import websocket_connect
+
+APP_DIR = Path(__file__).resolve().parents[1]  # .../my_app
+
+# Page names as announced by the server (pages/<n>_<Name>.py)
+HOMEPAGE = "Homepage"
+MATCHDAY_OVERVIEW = "Matchday overview"
+MATCH_ANALYSIS = "Match analysis"
+
+STEPS = ["homepage", "overview", "pick_matchday", "match_analysis"]
+
+RSS_SAMPLE_SECONDS = 0.25
+
+
+# Server process
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int) -> subprocess.Popen:
+    # Production like settings: no file watcher, no debug diagnostics
+    env = {k: v for k, v in os.environ.items() if k != "APP_DEBUG"}
+    cmd = [
+        sys.executable, "-m", "streamlit", "run", "app.py",
+        "--server.headless=true",
+        f"--server.port={port}",
+        "--server.fileWatcherType=none",
+        "--browser.gatherUsageStats=false",
+    ]
+    return subprocess.Popen(cmd, cwd=APP_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_healthy(url: str, timeout: float, server: subprocess.Popen | None = None) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server is not None and server.poll() is not None:
+            raise RuntimeError(f"Streamlit server exited with code {server.returncode}")
+        try:
+            with urllib.request.urlopen(url + "/_stcore/health", timeout=2) as resp:
+                if resp.status == 200:
+                    return
+        except (urllib.error.URLError, OSError):
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Streamlit server at {url} not healthy after {timeout:.0f} s")
+
+
+def process_rss(pid: int) -> tuple[int, int]:
+    # (current, peak) resident set size in bytes, (0, 0) where /proc is unavailable
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+        return int(fields["VmRSS"].split()[0]) * 1024, int(fields["VmHWM"].split()[0]) * 1024
+    except (OSError, KeyError, ValueError, IndexError):
+        return 0, 0
+
+
+async def sample_rss(pid: int, samples: list[int], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        samples.append(process_rss(pid)[0])
+        try:
+            await asyncio.wait_for(stop.wait(), RSS_SAMPLE_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+# Headless client, one websocket per session like a browser tab
+class Client:
+    def __init__(self, url: str, timeout: float):
+        self.url = url.replace("http://", "ws://").replace("https://", "wss://") + "/_stcore/stream"
+        self.timeout = timeout
+        self.ws = None
+        self.page_hash = ""
+        self.pages: dict[str, str] = {}  # page_script_hash -> page name
+        self.elements: list = []  # elements of the last script run
+        self.widgets: dict[str, WidgetState] = {}  # widget values the client keeps sending
+
+    async def connect(self) -> None:
+        self.ws = await asyncio.wait_for(websocket_connect(self.url, subprotocols=["streamlit"]), self.timeout)
+
+    def close(self) -> None:
+        if self.ws is not None:
+            self.ws.close()
+
+    @property
+    def page(self) -> str:
+        return self.pages.get(self.page_hash, "")
+
+    async def rerun(self, trigger: str | None = None) -> None:
+        msg = BackMsg()
+        msg.rerun_script.page_script_hash = self.page_hash
+        msg.rerun_script.widget_states.widgets.extend(self.widgets.values())
+        if trigger is not None:
+            msg.rerun_script.widget_states.widgets.add(id=trigger, trigger_value=True)
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+
+        # Read until the script run ends, a st.switch_page starts a new run on the new page
+        errors = []
+        while True:
+            raw = await asyncio.wait_for(self.ws.read_message(), self.timeout)
+            if raw is None:
+                raise RuntimeError("websocket closed by the server")
+            fwd = ForwardMsg()
+            fwd.ParseFromString(raw)
+            kind = fwd.WhichOneof("type")
+
+            if kind == "new_session":
+                if fwd.new_session.app_pages:
+                    self.pages = {p.page_script_hash: p.page_name for p in fwd.new_session.app_pages}
+                if fwd.new_session.page_script_hash != self.page_hash:
+                    self.widgets.clear()
+                self.page_hash = fwd.new_session.page_script_hash
+                self.elements = []
+                errors = []
+            elif kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                element = fwd.delta.new_element
+                self.elements.append(element)
+                if element.WhichOneof("type") == "exception":
+                    errors.append(f"{element.exception.type}: {element.exception.message}")
+            elif kind == "page_not_found":
+                raise RuntimeError(f"page not found: {fwd.page_not_found.page_name}")
+            elif kind == "script_finished":
+                if fwd.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    raise RuntimeError("script compile error")
+                if fwd.script_finished == ForwardMsg.FINISHED_SUCCESSFULLY:
+                    break
+
+        if errors:
+            raise RuntimeError(errors[0])
+
+    def find(self, kind: str, label: str) -> list:
+        # Widgets of the last run whose label contains the given text
+        return [
+            getattr(e, kind) for e in self.elements
+            if e.WhichOneof("type") == kind and label in getattr(e, kind).label
+        ]
+
+    def set_string(self, widget_id: str, value: str) -> None:
+        self.widgets[widget_id] = WidgetState(id=widget_id, string_value=value)
+
+
+def _expect_page(client: Client, step: str, page: str) -> None:
+    if client.page != page:
+        raise RuntimeError(f"{step}: expected page {page!r}, got {client.page!r}")
+
+
+async def _timed(timings: dict, step: str, coro) -> None:
+    start = time.perf_counter()
+    await coro
+    timings[step] = time.perf_counter() - start
+
+
+async def run_session(url: str, seed: int, timeout: float) -> dict:
+    rng = random.Random(seed)
+    timings: dict[str, float] = {}
+    client = Client(url, timeout)
+
+    try:
+        await client.connect()
+
+        # Entry page redirects to the homepage
+        await _timed(timings, "homepage", client.rerun())
+        _expect_page(client, "homepage", HOMEPAGE)
+
+        start = client.find("button", "START EXPLORING")
+        if not start:
+            raise RuntimeError("homepage: no START EXPLORING button")
+        await _timed(timings, "overview", client.rerun(trigger=start[0].id))
+        _expect_page(client, "overview", MATCHDAY_OVERVIEW)
+
+        # Pick a matchday in the sidebar
+        boxes = [b for b in client.find("selectbox", "Matchday") if b.label == "Matchday"]
+        if not boxes or not boxes[0].options:
+            raise RuntimeError("overview: no Matchday selectbox")
+        client.set_string(boxes[0].id, rng.choice(list(boxes[0].options)))
+        await _timed(timings, "pick_matchday", client.rerun())
+        _expect_page(client, "pick_matchday", MATCHDAY_OVERVIEW)
+
+        # Click "View" on one of the match cards, the server switches to Match analysis
+        views = [b for b in client.find("button", "View") if b.label == "View"]
+        if not views:
+            raise RuntimeError("pick_matchday: no match cards")
+        await _timed(timings, "match_analysis", client.rerun(trigger=rng.choice(views).id))
+        _expect_page(client, "match_analysis", MATCH_ANALYSIS)
+    except Exception as e:
+        return {"ok": False, "error": f"{type(e).__name__}: {e}", "timings": timings}
+    finally:
+        client.close()
+
+    return {"ok": True, "error": "", "timings": timings}
+
+
+def percentiles(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {"p50_ms": float("nan"), "p90_ms": float("nan"), "p99_ms": float("nan"), "max_ms": float("nan")}
+    arr = np.asarray(values) * 1000.0
+    p50, p90, p99 = np.percentile(arr, [50, 90, 99])
+    return {"p50_ms": float(p50), "p90_ms": float(p90), "p99_ms": float(p99), "max_ms": float(arr.max())}
+
+
+async def _drive(url: str, sessions: int, concurrency: int, seed: int, timeout: float, pid: int | None):
+    # At most `concurrency` sessions connected to the server at any time
+    limit = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> dict:
+        async with limit:
+            return await run_session(url, seed + i, timeout)
+
+    samples: list[int] = []
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_rss(pid, samples, stop)) if pid else None
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one(i) for i in range(sessions)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    if sampler is not None:
+        await sampler
+    return results, elapsed, samples
+
+
+def load_test(
+    sessions: int,
+    concurrency: int,
+    seed: int = 0,
+    timeout: float = 30.0,
+    url: str | None = None,
+    server_pid: int | None = None,
+) -> dict:
+    concurrency = max(1, min(concurrency, sessions))
+
+    server = None
+    if url is None:
+        port = free_port()
+        server = start_server(port)
+        url = f"http://127.0.0.1:{port}"
+        server_pid = server.pid
+    url = url.rstrip("/")
+
+    try:
+        wait_healthy(url, timeout, server)
+        rss_start = process_rss(server_pid)[0] if server_pid else 0
+        results, elapsed, samples = asyncio.run(_drive(url, sessions, concurrency, seed, timeout, server_pid))
+        rss_end, rss_peak = process_rss(server_pid) if server_pid else (0, 0)
+    finally:
+        if server is not None:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+    ok = [r for r in results if r["ok"]]
+    page_runs = sum(len(r["timings"]) for r in results)
+    session_times = [sum(r["timings"].values()) for r in ok]
+
+    return {
+        "url": url,
+        "sessions": sessions,
+        "concurrency": concurrency,
+        "ok": len(ok),
+        "errors": len(results) - len(ok),
+        "error_samples": sorted({r["error"] for r in results if not r["ok"]})[:5],
+        "elapsed_s": elapsed,
+        "sessions_per_s": len(ok) / elapsed if elapsed else float("nan"),
+        "page_runs_per_s": page_runs / elapsed if elapsed else float("nan"),
+        "session_latency": percentiles(session_times),
+        "step_latency": {
+            step: percentiles([r["timings"][step] for r in results if step in r["timings"]]) for step in STEPS
+        },
+        "server_pid": server_pid,
+        "server_rss_start_mb": rss_start / 2**20,
+        "server_rss_max_mb": max(samples + [rss_end], default=0) / 2**20,
+        "server_rss_end_mb": rss_end / 2**20,
+        "server_rss_peak_mb": rss_peak / 2**20,
+    }
+
+
+def print_report(report: dict) -> None:
+    print(
+        f"Sessions: {report['ok']}/{report['sessions']} ok, {report['errors']} errors, "
+        f"concurrency {report['concurrency']}, {report['elapsed_s']:.1f} s against {report['url']}"
+    )
+    print(f"Throughput: {report['sessions_per_s']:.2f} sessions/s, {report['page_runs_per_s']:.2f} page runs/s")
+
+    print(f"{'step':<16}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    rows = [("session", report["session_latency"])] + list(report["step_latency"].items())
+    for name, p in rows:
+        print(f"{name:<16}{p['p50_ms']:>10.1f}{p['p90_ms']:>10.1f}{p['p99_ms']:>10.1f}{p['max_ms']:>10.1f}")
+
+    if report["server_pid"] and report["server_rss_end_mb"]:
+        print(
+            f"Server RSS: {report['server_rss_start_mb']:.1f} MB before, {report['server_rss_max_mb']:.1f} MB max "
+            f"during, {report['server_rss_end_mb']:.1f} MB after the run ({report['server_rss_peak_mb']:.1f} MB peak)"
+        )
+    else:
+        print("Server RSS: not measured (pass --server-pid with --url, Linux only)")
+    for err in report["error_samples"]:
+        print("Error:", err)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test one dashboard server with concurrent sessions.")
+    parser.add_argument("--sessions", type=int, default=100, help="Number of simulated sessions")
+    parser.add_argument("--concurrency", type=int, default=10, help="Sessions connected at the same time")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for matchday and match choices")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds allowed per page run")
+    parser.add_argument("--url", default=None, help="Running server to test (default: start one)")
+    parser.add_argument("--server-pid", type=int, default=None, help="PID of the --url server, for RSS")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = load_test(
+        args.sessions,
+        args.concurrency,
+        seed=args.seed,
+        timeout=args.timeout,
+        url=args.url,
+        server_pid=args.server_pid,
+    )
+    if args.json:
+        print(json.dumps(report, indent=2, default=str))
+    else:
+        print_report(report)
+    return 0 if report["errors"] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())